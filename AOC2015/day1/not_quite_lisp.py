@@ -1,6 +1,15 @@
 import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, repeat
+import mmap
 from pathlib import Path
 
+CHUNK_SIZE = 1 << 20
+
+# Each byte as a signed step: up for "(", down for ")", still otherwise
+STEPS = bytes({ord("("): 1, ord(")"): 255}.get(c, 0) for c in range(256))
+
 
 def get_final_floor(instructions: str) -> int:
     floor = 0
@@ -18,16 +27,81 @@ def get_first_basement(instructions: str) -> int | None:
     return None
 
 
+def _floors(data: bytes, floor: int):
+    """
+    The floor before and after every byte of the data
+    """
+    steps = array("b")
+    steps.frombytes(data.translate(STEPS))
+    return accumulate(steps, initial=floor)
+
+
+def _delta(data: bytes) -> int:
+    return data.count(b"(") - data.count(b")")
+
+
+def _summary(data: bytes) -> tuple[int, int]:
+    """
+    How far the chunk moves Santa, and the lowest he gets within it
+    relative to where he started
+    """
+    return _delta(data), min(_floors(data, 0))
+
+
+def _summary_range(path: Path, chunk: tuple[int, int]) -> tuple[int, int]:
+    start, end = chunk
+    with path.open("rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _summary(mapped[start:end])
+
+
+def scan_floors(
+    path: Path, workers: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, int | None]:
+    """
+    The final floor and the first position in the basement for an
+    instruction file, reading any other bytes as staying put.
+    Chunk summaries are combined in order, and only the chunk where
+    the floor first reaches -1 is walked byte by byte. With workers
+    every summary is computed up front across a process pool.
+    """
+    size = path.stat().st_size
+    if not size:
+        return 0, None
+    chunks = [
+        (start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)
+    ]
+    summaries = None
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = list(executor.map(_summary_range, repeat(path), chunks))
+    floor = 0
+    basement = None
+    with path.open("rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for index, (start, end) in enumerate(chunks):
+                if summaries:
+                    delta, minimum = summaries[index]
+                elif basement is None and floor < end - start:
+                    delta, minimum = _summary(mapped[start:end])
+                else:
+                    # Already found, or too high up to reach the basement
+                    delta, minimum = _delta(mapped[start:end]), 0
+                if basement is None and floor + minimum <= -1:
+                    floors = enumerate(_floors(mapped[start:end], floor))
+                    basement = start + next(p for p, f in floors if f == -1)
+                floor += delta
+    return floor, basement
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
+    parser.add_argument("--workers", type=int)
     args = parser.parse_args()
 
-    text = args.filename.read_text()
-    final_floor = get_final_floor(text.strip())
+    final_floor, first_basement = scan_floors(args.filename, args.workers)
     print(final_floor)
-
-    first_basement = get_first_basement(text.strip())
     print(first_basement)
 
 
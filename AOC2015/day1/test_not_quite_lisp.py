@@ -1,5 +1,5 @@
 import pytest
-from not_quite_lisp import get_final_floor, get_first_basement
+from not_quite_lisp import get_final_floor, get_first_basement, scan_floors
 
 
 instructions_with_floors = [
@@ -23,3 +23,17 @@ def test_get_final_floor(instructions, expected):
 def test_get_first_basement():
     assert get_first_basement(")") == 1
     assert get_first_basement("()())") == 5
+
+
+@pytest.mark.parametrize("instructions,expected", instructions_with_floors)
+def test_scan_floors(tmp_path, instructions, expected):
+    path = tmp_path / "input.txt"
+    path.write_text(instructions + "\n")
+    first_basement = get_first_basement(instructions)
+    assert scan_floors(path, chunk_size=2) == (expected, first_basement)
+
+
+def test_scan_floors_workers(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("(()(()(" + "()" * 10 + ")))))" + "(")
+    assert scan_floors(path, workers=2, chunk_size=4) == (-1, 31)
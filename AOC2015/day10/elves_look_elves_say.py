@@ -1,5 +1,6 @@
 import argparse
 from dataclasses import dataclass
+from functools import cache
 
 
 @dataclass(frozen=True)
@@ -65,6 +66,229 @@ def digit_count(blocks: list[Block]) -> int:
     return sum(b.number for b in blocks)
 
 
+def blocks_to_text(blocks: list[Block]) -> str:
+    return "".join(str(b.digit) * b.number for b in blocks)
+
+
+# Conway's 92 audioactive elements: (name, sequence, decay products)
+ELEMENTS: list[tuple[str, str, tuple[str, ...]]] = [
+    ("H", "22", ("H",)),
+    ("He", "13112221133211322112211213322112", ("Hf", "Pa", "H", "Ca", "Li")),
+    ("Li", "312211322212221121123222112", ("He",)),
+    ("Be", "111312211312113221133211322112211213322112", ("Ge", "Ca", "Li")),
+    ("B", "1321132122211322212221121123222112", ("Be",)),
+    ("C", "3113112211322112211213322112", ("B",)),
+    ("N", "111312212221121123222112", ("C",)),
+    ("O", "132112211213322112", ("N",)),
+    ("F", "31121123222112", ("O",)),
+    ("Ne", "111213322112", ("F",)),
+    ("Na", "123222112", ("Ne",)),
+    ("Mg", "3113322112", ("Pm", "Na")),
+    ("Al", "1113222112", ("Mg",)),
+    ("Si", "1322112", ("Al",)),
+    ("P", "311311222112", ("Ho", "Si")),
+    ("S", "1113122112", ("P",)),
+    ("Cl", "132112", ("S",)),
+    ("Ar", "3112", ("Cl",)),
+    ("K", "1112", ("Ar",)),
+    ("Ca", "12", ("K",)),
+    ("Sc", "3113112221133112", ("Ho", "Pa", "H", "Ca", "Co")),
+    ("Ti", "11131221131112", ("Sc",)),
+    ("V", "13211312", ("Ti",)),
+    ("Cr", "31132", ("V",)),
+    ("Mn", "111311222112", ("Cr", "Si")),
+    ("Fe", "13122112", ("Mn",)),
+    ("Co", "32112", ("Fe",)),
+    ("Ni", "11133112", ("Zn", "Co")),
+    ("Cu", "131112", ("Ni",)),
+    ("Zn", "312", ("Cu",)),
+    ("Ga", "13221133122211332", ("Eu", "Ca", "Ac", "H", "Ca", "Zn")),
+    ("Ge", "31131122211311122113222", ("Ho", "Ga")),
+    ("As", "11131221131211322113322112", ("Ge", "Na")),
+    ("Se", "13211321222113222112", ("As",)),
+    ("Br", "3113112211322112", ("Se",)),
+    ("Kr", "11131221222112", ("Br",)),
+    ("Rb", "1321122112", ("Kr",)),
+    ("Sr", "3112112", ("Rb",)),
+    ("Y", "1112133", ("Sr", "U")),
+    ("Zr", "12322211331222113112211", ("Y", "H", "Ca", "Tc")),
+    ("Nb", "1113122113322113111221131221", ("Er", "Zr")),
+    ("Mo", "13211322211312113211", ("Nb",)),
+    ("Tc", "311322113212221", ("Mo",)),
+    ("Ru", "132211331222113112211", ("Eu", "Ca", "Tc")),
+    ("Rh", "311311222113111221131221", ("Ho", "Ru")),
+    ("Pd", "111312211312113211", ("Rh",)),
+    ("Ag", "132113212221", ("Pd",)),
+    ("Cd", "3113112211", ("Ag",)),
+    ("In", "11131221", ("Cd",)),
+    ("Sn", "13211", ("In",)),
+    ("Sb", "3112221", ("Pm", "Sn")),
+    ("Te", "1322113312211", ("Eu", "Ca", "Sb")),
+    ("I", "311311222113111221", ("Ho", "Te")),
+    ("Xe", "11131221131211", ("I",)),
+    ("Cs", "13211321", ("Xe",)),
+    ("Ba", "311311", ("Cs",)),
+    ("La", "11131", ("Ba",)),
+    ("Ce", "1321133112", ("La", "H", "Ca", "Co")),
+    ("Pr", "31131112", ("Ce",)),
+    ("Nd", "111312", ("Pr",)),
+    ("Pm", "132", ("Nd",)),
+    ("Sm", "311332", ("Pm", "Ca", "Zn")),
+    ("Eu", "1113222", ("Sm",)),
+    ("Gd", "13221133112", ("Eu", "Ca", "Co")),
+    ("Tb", "3113112221131112", ("Ho", "Gd")),
+    ("Dy", "111312211312", ("Tb",)),
+    ("Ho", "1321132", ("Dy",)),
+    ("Er", "311311222", ("Ho", "Pm")),
+    ("Tm", "11131221133112", ("Er", "Ca", "Co")),
+    ("Yb", "1321131112", ("Tm",)),
+    ("Lu", "311312", ("Yb",)),
+    ("Hf", "11132", ("Lu",)),
+    ("Ta", "13112221133211322112211213322113", ("Hf", "Pa", "H", "Ca", "W")),
+    ("W", "312211322212221121123222113", ("Ta",)),
+    ("Re", "111312211312113221133211322112211213322113", ("Ge", "Ca", "W")),
+    ("Os", "1321132122211322212221121123222113", ("Re",)),
+    ("Ir", "3113112211322112211213322113", ("Os",)),
+    ("Pt", "111312212221121123222113", ("Ir",)),
+    ("Au", "132112211213322113", ("Pt",)),
+    ("Hg", "31121123222113", ("Au",)),
+    ("Tl", "111213322113", ("Hg",)),
+    ("Pb", "123222113", ("Tl",)),
+    ("Bi", "3113322113", ("Pm", "Pb")),
+    ("Po", "1113222113", ("Bi",)),
+    ("At", "1322113", ("Po",)),
+    ("Rn", "311311222113", ("Ho", "At")),
+    ("Fr", "1113122113", ("Rn",)),
+    ("Ra", "132113", ("Fr",)),
+    ("Ac", "3113", ("Ra",)),
+    ("Th", "1113", ("Ac",)),
+    ("Pa", "13", ("Th",)),
+    ("U", "3", ("Pa",)),
+]
+
+# The transuranic elements, one pair for every digit n >= 4 that ends a sequence
+for n in range(4, 10):
+    ELEMENTS += [
+        (
+            f"Np{n}",
+            f"1311222113321132211221121332211{n}",
+            ("Hf", "Pa", "H", "Ca", f"Pu{n}"),
+        ),
+        (f"Pu{n}", f"31221132221222112112322211{n}", (f"Np{n}",)),
+    ]
+
+ELEMENT_INDEX = {name: i for i, (name, _, _) in enumerate(ELEMENTS)}
+SEQUENCES = [sequence for _, sequence, _ in ELEMENTS]
+DECAYS = [[ELEMENT_INDEX[d] for d in decay] for _, _, decay in ELEMENTS]
+
+
+@cache
+def can_split(left: int, right: int) -> bool:
+    """
+    Whether the boundary between two adjacent elements holds forever.
+    It holds on a given day if the last digit of the left side differs
+    from the first digit of the right side, and those only depend on the
+    last and first elements, so follow that pair until it repeats.
+    """
+    seen = set()
+    while (left, right) not in seen:
+        if SEQUENCES[left][-1] == SEQUENCES[right][0]:
+            return False
+        seen.add((left, right))
+        left, right = DECAYS[left][-1], DECAYS[right][0]
+    return True
+
+
+def split_into_elements(text: str) -> list[int] | None:
+    """
+    Split text into elements whose boundaries all hold forever,
+    or None if there is no such split yet
+    """
+    # previous[position][element]: the element before the one ending here
+    previous: list[dict[int, int]] = [{} for _ in range(len(text) + 1)]
+    previous[0][-1] = -1
+    for position in range(len(text)):
+        ends = previous[position]
+        if not ends:
+            continue
+        for element, sequence in enumerate(SEQUENCES):
+            if not text.startswith(sequence, position):
+                continue
+            end = position + len(sequence)
+            if element in previous[end]:
+                continue
+            for last in ends:
+                if last == -1 or can_split(last, element):
+                    previous[end][element] = last
+                    break
+    if not previous[len(text)]:
+        return None
+    elements = []
+    position = len(text)
+    element = next(iter(previous[len(text)]))
+    while element != -1:
+        elements.append(element)
+        last = previous[position][element]
+        position -= len(SEQUENCES[element])
+        element = last
+    return elements[::-1]
+
+
+def _multiply(a: list[list[int]], b: list[list[int]]) -> list[list[int]]:
+    result = []
+    for row in a:
+        product = [0] * len(b[0])
+        for k, x in enumerate(row):
+            if not x:
+                continue
+            for j, y in enumerate(b[k]):
+                if y:
+                    product[j] += x * y
+        result.append(product)
+    return result
+
+
+def evolve_element_counts(counts: list[int], times: int) -> list[int]:
+    """
+    Element counts after the given number of days, using
+    a big integer power of the decay matrix
+    """
+    n = len(ELEMENTS)
+    matrix = [[0] * n for _ in range(n)]
+    for i, decay in enumerate(DECAYS):
+        for j in decay:
+            matrix[i][j] += 1
+    vector = [counts]
+    while times:
+        if times & 1:
+            vector = _multiply(vector, matrix)
+        times >>= 1
+        if times:
+            matrix = _multiply(matrix, matrix)
+    return vector[0]
+
+
+def evolved_digit_count(text: str, times: int) -> int:
+    """
+    Digit count after evolving text the given number of times.
+    The blocks are simulated only until they split into elements,
+    after which just the element counts are evolved.
+    """
+    blocks = Block.parse_into_blocks(text)
+    for day in range(times + 1):
+        elements = split_into_elements(blocks_to_text(blocks))
+        if elements is not None:
+            break
+        if day == times:
+            return digit_count(blocks)
+        blocks = evolve_list_of_blocks(blocks)
+    counts = [0] * len(ELEMENTS)
+    for element in elements:
+        counts[element] += 1
+    counts = evolve_element_counts(counts, times - day)
+    return sum(count * len(SEQUENCES[i]) for i, count in enumerate(counts))
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("input")
@@ -72,13 +296,8 @@ def main():
 
     num = args.input
 
-    blocks = Block.parse_into_blocks(num)
-    evolved = evolve_times(blocks, 40)
-    digits = digit_count(evolved)
-    print(digits)
-    evolved = evolve_times(blocks, 50)
-    digits = digit_count(evolved)
-    print(digits)
+    print(evolved_digit_count(num, 40))
+    print(evolved_digit_count(num, 50))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,15 @@
-from elves_look_elves_say import Block, evolve_list_of_blocks
+from elves_look_elves_say import (
+    ELEMENT_INDEX,
+    ELEMENTS,
+    SEQUENCES,
+    Block,
+    blocks_to_text,
+    digit_count,
+    evolve_list_of_blocks,
+    evolve_times,
+    evolved_digit_count,
+    split_into_elements,
+)
 
 
 def test_parse_into_blocks():
@@ -16,3 +27,35 @@ def test_evolve_list_of_blocks():
     assert evolve_list_of_blocks(blocks) == [Block(2, 1), Block(1, 1)]
     blocks = [Block(1, 1), Block(2, 1), Block(1, 2)]
     assert evolve_list_of_blocks(blocks) == [Block(1, 3), Block(2, 2), Block(1, 1)]
+
+
+def test_element_decays():
+    for _, sequence, decay in ELEMENTS:
+        evolved = blocks_to_text(
+            evolve_list_of_blocks(Block.parse_into_blocks(sequence))
+        )
+        assert evolved == "".join(SEQUENCES[ELEMENT_INDEX[d]] for d in decay)
+
+
+def test_split_into_elements():
+    hf, sn = ELEMENT_INDEX["Hf"], ELEMENT_INDEX["Sn"]
+    assert split_into_elements("1113213211") == [hf, sn]
+    assert split_into_elements("2222") is None
+
+
+def test_evolved_digit_count():
+    for text in ["1", "3113322113", "1113122113"]:
+        blocks = Block.parse_into_blocks(text)
+        for times in [0, 1, 10, 30]:
+            expected = digit_count(evolve_times(blocks, times))
+            assert evolved_digit_count(text, times) == expected
+
+
+def test_evolved_digit_count_transuranic():
+    np4 = ELEMENT_INDEX["Np4"]
+    assert split_into_elements(SEQUENCES[np4]) == [np4]
+    for text in ["4", "1411", "3335"]:
+        blocks = Block.parse_into_blocks(text)
+        for times in [0, 10, 25]:
+            expected = digit_count(evolve_times(blocks, times))
+            assert evolved_digit_count(text, times) == expected
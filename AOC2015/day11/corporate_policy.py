@@ -1,5 +1,7 @@
 import argparse
+from collections.abc import Iterator
 from string import ascii_lowercase
+from typing import NamedTuple
 
 
 def password_to_numbers(text: str) -> list[int]:
@@ -58,16 +60,112 @@ def next_password(password: str) -> str | None:
     return None
 
 
+class PolicyState(NamedTuple):
+    last: int | None
+    run: int
+    has_straight: bool
+    pairs: int
+    can_pair: bool
+
+
+class PasswordPolicy:
+    """
+    Builds the next password satisfying the policy directly: keep the longest
+    prefix that can still be completed, bump the next letter, then fill the
+    smallest valid tail letter by letter
+    """
+
+    def __init__(self, alphabet: str = ascii_lowercase, forbidden: str = "iol"):
+        self.alphabet = alphabet
+        self.index = {c: i for i, c in enumerate(alphabet)}
+        self.allowed = [i for i, c in enumerate(alphabet) if c not in forbidden]
+        self._completable: dict[tuple[PolicyState, int], bool] = {}
+
+    def _step(self, state: PolicyState, letter: int) -> PolicyState:
+        if state.last is not None and letter == state.last + 1:
+            run = min(state.run + 1, 3)
+        else:
+            run = 1
+        if state.can_pair and letter == state.last:
+            pairs, can_pair = min(state.pairs + 1, 2), False
+        else:
+            pairs, can_pair = state.pairs, True
+        return PolicyState(letter, run, state.has_straight or run == 3, pairs, can_pair)
+
+    def _is_done(self, state: PolicyState) -> bool:
+        return state.has_straight and state.pairs == 2
+
+    def is_completable(self, state: PolicyState, remaining: int) -> bool:
+        key = (state, remaining)
+        if key not in self._completable:
+            if remaining == 0:
+                result = self._is_done(state)
+            else:
+                result = any(
+                    self.is_completable(self._step(state, letter), remaining - 1)
+                    for letter in self.allowed
+                )
+            self._completable[key] = result
+        return self._completable[key]
+
+    def _state_of(self, letters: list[int]) -> PolicyState | None:
+        state = PolicyState(None, 0, False, 0, False)
+        allowed = set(self.allowed)
+        for letter in letters:
+            if letter not in allowed:
+                return None
+            state = self._step(state, letter)
+        return state
+
+    def is_valid(self, password: str) -> bool:
+        state = self._state_of([self.index[c] for c in password])
+        return state is not None and self._is_done(state)
+
+    def next_password(self, password: str) -> str | None:
+        letters = [self.index[c] for c in password]
+        for position in range(len(letters) - 1, -1, -1):
+            state = self._state_of(letters[:position])
+            if state is None:
+                continue
+            remaining = len(letters) - position - 1
+            for letter in self.allowed:
+                if letter <= letters[position]:
+                    continue
+                after = self._step(state, letter)
+                if self.is_completable(after, remaining):
+                    return "".join(
+                        self.alphabet[i]
+                        for i in letters[:position]
+                        + [letter]
+                        + self._tail(after, remaining)
+                    )
+        return None
+
+    def _tail(self, state: PolicyState, remaining: int) -> list[int]:
+        tail = []
+        for left in range(remaining - 1, -1, -1):
+            for letter in self.allowed:
+                after = self._step(state, letter)
+                if self.is_completable(after, left):
+                    tail.append(letter)
+                    state = after
+                    break
+        return tail
+
+    def passwords_after(self, password: str) -> Iterator[str]:
+        while (next_pw := self.next_password(password)) is not None:
+            yield next_pw
+            password = next_pw
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("input")
     args = parser.parse_args()
 
-    password = args.input
-    next_pw = next_password(password)
-    print(next_pw)
-    next_next_pw = next_password(next_pw)
-    print(next_next_pw)
+    passwords = PasswordPolicy().passwords_after(args.input)
+    print(next(passwords))
+    print(next(passwords))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
+from itertools import islice
+
 from corporate_policy import (
+    PasswordPolicy,
     check_password,
     next_password,
     next_candidate_password,
@@ -27,3 +30,24 @@ def test_check_password():
 def test_next_password():
     assert next_password("abcdefgh") == "abcdffaa"
     assert next_password("ghijklmn") == "ghjaabcc"
+
+
+def test_policy_next_password():
+    policy = PasswordPolicy()
+    assert policy.next_password("abcdefgh") == "abcdffaa"
+    assert policy.next_password("ghijklmn") == "ghjaabcc"
+    assert policy.next_password("zzzzzzzz") is None
+
+
+def test_policy_passwords_after():
+    passwords = PasswordPolicy().passwords_after("hepxcrrq")
+    assert list(islice(passwords, 3)) == ["hepxxyzz", "heqaabcc", "heqbbcdd"]
+
+
+def test_policy_custom_alphabet():
+    policy = PasswordPolicy(alphabet="abcd", forbidden="")
+    assert policy.is_valid("aabcc")
+    assert not policy.is_valid("aabcd")
+    assert policy.next_password("aabcc") == "bbcdd"
+    assert policy.next_password("bbcdd") is None
+    assert policy.next_password("aaaaaa") == "aaaabc"
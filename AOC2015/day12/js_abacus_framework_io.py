@@ -1,10 +1,13 @@
 import argparse
-import json
+from dataclasses import dataclass
 from pathlib import Path
 import re
+from typing import TextIO
 
 
 NUMBER_REGEX = r"-?\d+"
+TOKEN_REGEX = re.compile(r'"|-?\d+|[{}\[\]:,]')
+STRING_REST_REGEX = re.compile(r'((?:[^"\\]|\\.)*)(")?')
 
 
 def sum_all_numbers(text: str) -> int:
@@ -25,17 +28,107 @@ def sum_all_json(obj: dict | list | int | str) -> int:
         return sum(sum_all_json(k) + sum_all_json(v) for k, v in obj.items())
 
 
+@dataclass
+class Frame:
+    is_object: bool
+    total: int = 0
+    red: bool = False
+    expect_value: bool = False
+
+
+class StreamingJsonSummer:
+    """
+    Sums the numbers of a JSON document fed in chunks, without parsing it.
+    Each open object or list keeps only its partial sum on a stack, and
+    strings are never held beyond the few characters needed to spot "red".
+    """
+
+    def __init__(self, ignore_red: bool = True):
+        self.ignore_red = ignore_red
+        self.stack = [Frame(is_object=False)]
+        self.carry = ""
+        self.in_string = False
+        self.string_start = ""
+
+    def feed(self, chunk: str, final: bool = False):
+        buffer = self.carry + chunk
+        self.carry = ""
+        position = 0
+        while position < len(buffer):
+            if self.in_string:
+                m = STRING_REST_REGEX.match(buffer, position)
+                if len(self.string_start) < 4:
+                    self.string_start += m.group(1)[: 4 - len(self.string_start)]
+                position = m.end()
+                if not m.group(2):
+                    # Keep a trailing backslash until its escaped character arrives
+                    self.carry = buffer[position:]
+                    return
+                self._end_string()
+                continue
+            m = TOKEN_REGEX.search(buffer, position)
+            if not m:
+                if buffer.endswith("-") and not final:
+                    self.carry = "-"
+                return
+            token = m.group()
+            if token[-1].isdigit() and m.end() == len(buffer) and not final:
+                self.carry = token
+                return
+            position = m.end()
+            self._token(token)
+
+    def _end_string(self):
+        self.in_string = False
+        top = self.stack[-1]
+        if top.is_object and top.expect_value and self.string_start == "red":
+            top.red = True
+
+    def _token(self, token: str):
+        top = self.stack[-1]
+        if token == '"':
+            self.in_string = True
+            self.string_start = ""
+        elif token == "{":
+            self.stack.append(Frame(is_object=True))
+        elif token == "[":
+            self.stack.append(Frame(is_object=False))
+        elif token == ":":
+            top.expect_value = True
+        elif token == ",":
+            top.expect_value = False
+        elif token in "}]":
+            self.stack.pop()
+            if not (self.ignore_red and top.red):
+                self.stack[-1].total += top.total
+        else:
+            top.total += int(token)
+
+    def result(self) -> int:
+        self.feed("", final=True)
+        return self.stack[0].total
+
+
+def sum_json_stream(
+    stream: TextIO, ignore_red: bool = True, chunk_size: int = 1 << 20
+) -> int:
+    summer = StreamingJsonSummer(ignore_red)
+    while chunk := stream.read(chunk_size):
+        summer.feed(chunk)
+    return summer.result()
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
     args = parser.parse_args()
 
-    text = args.filename.read_text()
-    number_sum = sum_all_numbers(text)
+    with args.filename.open() as stream:
+        number_sum = sum_json_stream(stream, ignore_red=False)
     print(number_sum)
 
-    json_obj = json.loads(text)
-    json_sum_no_red = sum_all_json(json_obj)
+    with args.filename.open() as stream:
+        json_sum_no_red = sum_json_stream(stream)
     print(json_sum_no_red)
 
 
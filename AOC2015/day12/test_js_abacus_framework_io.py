@@ -1,4 +1,6 @@
-from js_abacus_framework_io import sum_all_numbers, sum_all_json
+import io
+
+from js_abacus_framework_io import sum_all_numbers, sum_all_json, sum_json_stream
 
 
 def test_sum_all_numbers():
@@ -17,3 +19,27 @@ def test_sum_all_json():
     assert sum_all_json([1, {"c": "red", "b": 2}, 3]) == 4
     assert sum_all_json({"d": "red", "e": [1, 2, 3, 4], "f": 5}) == 0
     assert sum_all_json([1, "red", 5]) == 6
+
+
+def test_sum_json_stream():
+    cases = [
+        ("[1,2,3]", 6),
+        ('[1,{"c":"red","b":2},3]', 4),
+        ('{"d":"red","e":[1,2,3,4],"f":5}', 0),
+        ('[1,"red",5]', 6),
+        ('{"red":[-12,"reds"],"a":{"b":"red"}}', -12),
+    ]
+    for text, expected in cases:
+        for chunk_size in (1, 2, 5, 1 << 20):
+            stream = io.StringIO(text)
+            assert sum_json_stream(stream, chunk_size=chunk_size) == expected
+
+
+def test_sum_json_stream_keeping_red():
+    stream = io.StringIO('[1,{"c":"red","b":-20},3]')
+    assert sum_json_stream(stream, ignore_red=False, chunk_size=3) == -16
+
+
+def test_sum_json_stream_deep_nesting():
+    stream = io.StringIO("[" * 100000 + "7" + "]" * 100000)
+    assert sum_json_stream(stream) == 7
@@ -1,5 +1,5 @@
 import argparse
-from itertools import permutations, pairwise
+from itertools import pairwise
 from pathlib import Path
 import re
 
@@ -38,13 +38,81 @@ def calculate_total_happiness(
     return total
 
 
+def held_karp(
+    weights: list[list[int | None]], cyclic: bool = False
+) -> tuple[int, int] | None:
+    """
+    Minimum and maximum total weight of a path visiting every node once,
+    or of a closed tour when cyclic, found together by Held-Karp DP.
+    None weights are missing edges. Returns None if no such path exists.
+    """
+    if not cyclic:
+        # An open path is a tour through an extra node joined to everything
+        weights = [[0] * (len(weights) + 1)] + [[0] + row for row in weights]
+    n = len(weights) - 1
+    if n == 0:
+        return 0, 0
+    full = (1 << n) - 1
+    # lows[mask][j]: best tour from node 0 through mask, ending at node j + 1
+    lows: list[list[int | None] | None] = [None] * (full + 1)
+    highs: list[list[int | None] | None] = [None] * (full + 1)
+    for j in range(n):
+        first = weights[0][j + 1]
+        if first is not None:
+            lows[1 << j] = [first if k == j else None for k in range(n)]
+            highs[1 << j] = [first if k == j else None for k in range(n)]
+    for mask in range(1, full + 1):
+        low, high = lows[mask], highs[mask]
+        if low is None or high is None:
+            continue
+        for j in range(n):
+            if low[j] is None:
+                continue
+            row = weights[j + 1]
+            for k in range(n):
+                bit = 1 << k
+                if mask & bit or row[k + 1] is None:
+                    continue
+                after = mask | bit
+                if lows[after] is None:
+                    lows[after] = [None] * n
+                    highs[after] = [None] * n
+                next_low, next_high = lows[after], highs[after]
+                w = row[k + 1]
+                if next_low[k] is None or low[j] + w < next_low[k]:
+                    next_low[k] = low[j] + w
+                if next_high[k] is None or high[j] + w > next_high[k]:
+                    next_high[k] = high[j] + w
+    low, high = lows[full], highs[full]
+    if low is None or high is None:
+        return None
+    closing = [weights[j + 1][0] for j in range(n)]
+    lows_closed = [
+        low[j] + closing[j]
+        for j in range(n)
+        if low[j] is not None and closing[j] is not None
+    ]
+    highs_closed = [
+        high[j] + closing[j]
+        for j in range(n)
+        if high[j] is not None and closing[j] is not None
+    ]
+    if not lows_closed:
+        return None
+    return min(lows_closed), max(highs_closed)
+
+
 def calculate_maximum_happiness(connections: dict[str, dict[str, int]]):
-    maximum = None
-    for arrangement in permutations(connections):
-        happiness = calculate_total_happiness(arrangement, connections)
-        if maximum is None or maximum < happiness:
-            maximum = happiness
-    return maximum
+    people = list(connections)
+    happiness: list[list[int | None]] = [
+        [
+            connections[p1][p2] + connections[p2][p1] if p1 != p2 else None
+            for p2 in people
+        ]
+        for p1 in people
+    ]
+    extremes = held_karp(happiness, cyclic=True)
+    return extremes[1] if extremes else None
 
 
 def main():
@@ -1,4 +1,8 @@
-from knights_of_the_dinner_table import parse_connections, calculate_maximum_happiness
+from knights_of_the_dinner_table import (
+    calculate_maximum_happiness,
+    held_karp,
+    parse_connections,
+)
 
 
 def test_parse_connections():
@@ -21,3 +25,9 @@ def test_maximum_happiness():
     David would gain 41 happiness units by sitting next to Carol."""
     connections = parse_connections(text)
     assert calculate_maximum_happiness(connections) == 330
+
+
+def test_held_karp_cyclic():
+    happiness = [[None, 4, -1], [4, None, 3], [-1, 3, None]]
+    assert held_karp(happiness, cyclic=True) == (6, 6)
+    assert held_karp(happiness) == (2, 7)
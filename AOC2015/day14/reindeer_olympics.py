@@ -1,5 +1,6 @@
 import argparse
 from dataclasses import dataclass
+from heapq import heapify, heapreplace
 import re
 from pathlib import Path
 
@@ -68,6 +69,57 @@ def get_race_winning_points(reindeer: list[Reindeer], time: int) -> int:
     return max(points.values())
 
 
+def _score_interval(
+    positions: list[int], speeds: list[int], length: int, points: list[int]
+):
+    """
+    Award the points for the next length seconds, during which every
+    reindeer keeps its speed. The lead only changes when a faster reindeer
+    catches the leaders, so jump straight to the next catch-up second.
+    """
+    k = 1
+    while k <= length:
+        values = [p + v * k for p, v in zip(positions, speeds)]
+        lead = max(values)
+        leaders = [i for i, d in enumerate(values) if d == lead]
+        fastest = max(speeds[i] for i in leaders)
+        for i in leaders:
+            points[i] += 1
+        next_k = length + 1
+        for j, d in enumerate(values):
+            if speeds[j] > fastest:
+                gap, closing = lead - d, speeds[j] - fastest
+                next_k = min(next_k, k + -(-gap // closing))
+        for i in leaders:
+            if speeds[i] == fastest:
+                points[i] += next_k - k - 1
+        k = next_k
+
+
+def get_race_winning_points_by_events(reindeer: list[Reindeer], time: int) -> int:
+    """
+    Only re-evaluate the race when a reindeer starts or stops flying
+    """
+    points = [0] * len(reindeer)
+    positions = [0] * len(reindeer)
+    flying = [True] * len(reindeer)
+    events = [(r.duration, i) for i, r in enumerate(reindeer)]
+    heapify(events)
+    now = 0
+    while now < time:
+        until = min(events[0][0], time)
+        speeds = [r.speed if f else 0 for r, f in zip(reindeer, flying)]
+        _score_interval(positions, speeds, until - now, points)
+        positions = [p + v * (until - now) for p, v in zip(positions, speeds)]
+        now = until
+        while events[0][0] == now:
+            i = events[0][1]
+            flying[i] = not flying[i]
+            r = reindeer[i]
+            heapreplace(events, (now + (r.duration if flying[i] else r.rest), i))
+    return max(points)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
@@ -78,7 +130,7 @@ def main():
     race_winning_distance = get_race_winning_distance(reindeers, 2503)
     print(race_winning_distance)
 
-    race_winning_points = get_race_winning_points(reindeers, 2503)
+    race_winning_points = get_race_winning_points_by_events(reindeers, 2503)
     print(race_winning_points)
 
 
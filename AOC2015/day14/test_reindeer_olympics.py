@@ -2,6 +2,7 @@ from reindeer_olympics import (
     Reindeer,
     get_race_winning_distance,
     get_race_winning_points,
+    get_race_winning_points_by_events,
 )
 
 
@@ -26,3 +27,11 @@ def test_get_race_winning_distance():
 def test_get_race_winning_points():
     reindeer = [Reindeer("Comet", 14, 10, 127), Reindeer("Dancer", 16, 11, 162)]
     assert get_race_winning_points(reindeer, 1000) == 689
+
+
+def test_get_race_winning_points_by_events():
+    reindeer = [Reindeer("Comet", 14, 10, 127), Reindeer("Dancer", 16, 11, 162)]
+    assert get_race_winning_points_by_events(reindeer, 1000) == 689
+    for time in (1, 10, 140, 1000):
+        expected = get_race_winning_points(reindeer, time)
+        assert get_race_winning_points_by_events(reindeer, time) == expected
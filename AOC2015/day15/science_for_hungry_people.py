@@ -1,5 +1,6 @@
 import argparse
 from dataclasses import dataclass
+import math
 from pathlib import Path
 import re
 
@@ -81,6 +82,200 @@ def _get_amounts(length: int, total_amount: int):
                 yield [a] + x
 
 
+def _bound(
+    corners: list[list[int]], totals: list[int] | None, excess: list[int] | None
+) -> tuple[int, int]:
+    """
+    Upper bound on the score of any mix of the corners, as a fraction.
+    By AM-GM, a score is at most (sum of w_k * total_k / 4) ** 4 / prod(w)
+    for any positive weights, and that sum is linear so its largest value
+    is at a corner. Weights of 1 / totals of a good recipe keep it tight.
+    With the calories fixed, any multiple of each corner's calorie excess
+    can be added, since it cancels out in the mix.
+    """
+    if totals is None:
+        numerator = 1
+        for k in range(4):
+            numerator *= max(0, max(corner[k] for corner in corners))
+        return numerator, 1
+    weights = [math.prod(totals[:k] + totals[k + 1 :]) for k in range(4)]
+    values = [sum(w * c for w, c in zip(weights, corner)) for corner in corners]
+    if excess is not None:
+        rising = [(v, e) for v, e in zip(values, excess) if e > 0]
+        falling = [(v, e) for v, e in zip(values, excess) if e < 0]
+        if rising and falling:
+            # The multiple where the lines value + multiple * excess
+            # have the lowest maximum, found where two of them cross
+            _, multiple = max(
+                ((u * e - v * f) / (e - f), (u - v) / (e - f))
+                for v, e in rising
+                for u, f in falling
+            )
+            values = [v + round(multiple) * e for v, e in zip(values, excess)]
+    return max(0, max(values)) ** 4, 256 * math.prod(totals) ** 3
+
+
+def get_maximal_scores(
+    ingredients: list[Ingredient],
+    total_amount: int = MAX_INGREDIENTS,
+    calories: int = CALORIES,
+) -> tuple[int, int]:
+    """
+    Best score overall and best score with exactly the given calories,
+    found together by one branch and bound search over the amounts.
+    The best score reachable with a fixed amount of one ingredient rises
+    and then falls as that amount grows, so each ingredient's amounts are
+    walked outwards from the best recipe so far until a bound drops below
+    a score already found on the way.
+    """
+    # Identical ingredients can be merged without changing either score
+    properties = list(
+        dict.fromkeys(
+            (i.capacity, i.durability, i.flavor, i.texture, i.calories)
+            for i in ingredients
+        )
+    )
+    n = len(properties)
+    if not n:
+        return 0, 0
+    # reachable[i][r] has bit c set when r teaspoons of the ingredients from
+    # i onwards can add up to c + r * lowest calories
+    lowest = min(p[4] for p in properties)
+    reachable = [[1] + [0] * total_amount for _ in range(n + 1)]
+    for i in range(n - 1, -1, -1):
+        step = properties[i][4] - lowest
+        for r in range(1, total_amount + 1):
+            reachable[i][r] = reachable[i + 1][r] | reachable[i][r - 1] << step
+
+    def is_reachable(index: int, remaining: int, sums: list[int]) -> bool:
+        needed = calories - sums[4] - remaining * lowest
+        return needed >= 0 and bool(reachable[index][remaining] >> needed & 1)
+
+    best = [0, 0]
+    best_recipe: list[int] = []
+
+    def product(final: list[int]) -> int:
+        score = 1
+        for k in range(4):
+            score *= max(0, final[k])
+        return score
+
+    def record(final: list[int], recipe: list[int], found: list[list]):
+        score = product(final)
+        for k in (0, 1):
+            if k and final[4] != calories:
+                continue
+            if score > found[k][0]:
+                found[k] = [score, final]
+            if score > best[k]:
+                best[k] = score
+                if not k:
+                    best_recipe[:] = recipe
+
+    def finish(sums: list[int], remaining: int, recipe: list[int], found: list[list]):
+        """
+        Split the remaining teaspoons between the last two ingredients.
+        Every total is linear in the amount of the first of them, so the
+        score is positive on one interval and has a single peak there.
+        The calories pin down at most one other split worth scoring.
+        """
+        base = [s + remaining * l for s, l in zip(sums, properties[-1])]
+        slope = [f - l for f, l in zip(properties[-2], properties[-1])]
+
+        def totals(amount: int) -> list[int]:
+            return [b + amount * d for b, d in zip(base, slope)]
+
+        low, high = 0, remaining
+        for k in range(4):
+            if slope[k] > 0:
+                low = max(low, -base[k] // slope[k] + 1)
+            elif slope[k] < 0:
+                high = min(high, (base[k] - 1) // -slope[k])
+            elif base[k] <= 0:
+                return
+        if low > high:
+            return
+        start, stop = low, high
+        while start < stop:
+            middle = (start + stop) // 2
+            if product(totals(middle + 1)) > product(totals(middle)):
+                start = middle + 1
+            else:
+                stop = middle
+        record(totals(start), recipe + [start, remaining - start], found)
+        needed = calories - base[4]
+        if slope[4] and not needed % slope[4] and low <= needed // slope[4] <= high:
+            amount = needed // slope[4]
+            record(totals(amount), recipe + [amount, remaining - amount], found)
+
+    def search(
+        index: int,
+        remaining: int,
+        sums: list[int],
+        recipe: list[int],
+        good: list,
+    ) -> list[list]:
+        """
+        Best score and totals for each objective among the recipes
+        starting with the given amounts, with good holding totals
+        of a good recipe per objective to weight the bounds
+        """
+        found: list[list] = [[0, None], [0, None]]
+        if index == n - 1:
+            final = [s + remaining * c for s, c in zip(sums, properties[index])]
+            record(final, recipe + [remaining], found)
+            return found
+        if index == n - 2:
+            finish(sums, remaining, recipe, found)
+            return found
+        coefficients = properties[index]
+        if best_recipe:
+            start = min(best_recipe[index], remaining)
+        else:
+            start = remaining // (n - index)
+        # Both objectives' best scores on the walk so far, per direction
+        seen = [0, 0]
+        for amounts in (range(start, remaining + 1), range(start - 1, -1, -1)):
+            weights = list(good)
+            peak = list(seen)
+            done = [False, False]
+            for amount in amounts:
+                after = [s + amount * c for s, c in zip(sums, coefficients)]
+                left = remaining - amount
+                corners = [
+                    [a + left * c for a, c in zip(after, properties[j])]
+                    for j in range(index + 1, n)
+                ]
+                wanted = False
+                for k in (0, 1):
+                    if done[k] or k and not is_reachable(index + 1, left, after):
+                        continue
+                    excess = [c[4] - calories for c in corners] if k else None
+                    numerator, denominator = _bound(corners, weights[k], excess)
+                    if numerator < peak[k] * denominator:
+                        done[k] = True
+                    elif numerator > best[k] * denominator:
+                        wanted = True
+                if done[0] and done[1]:
+                    break
+                if not wanted:
+                    continue
+                child = search(index + 1, left, after, recipe + [amount], weights)
+                for k in (0, 1):
+                    score, final = child[k]
+                    if score > peak[k]:
+                        peak[k] = score
+                        weights[k] = final[:4]
+                    if score > found[k][0]:
+                        found[k] = child[k]
+                if amount == start:
+                    seen = list(peak)
+        return found
+
+    search(0, total_amount, [0] * 5, [], [None, None])
+    return best[0], best[1]
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
@@ -88,10 +283,9 @@ def main():
 
     text = args.filename.read_text()
     ingredients = [Ingredient.parse(line) for line in text.splitlines()]
-    maximal_score = get_maximal_score(ingredients)
-    print(maximal_score)
-    maximal_score = get_maximal_score_for_restricted_calories(ingredients)
+    maximal_score, maximal_restricted_score = get_maximal_scores(ingredients)
     print(maximal_score)
+    print(maximal_restricted_score)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
 from science_for_hungry_people import (
     Ingredient,
     get_maximal_score,
+    get_maximal_scores,
+    get_calories,
     get_score,
     get_maximal_score_for_restricted_calories,
 )
@@ -33,3 +35,52 @@ def test_get_maximal_score_restricted_calories():
         Ingredient("Cinnamon", 2, 3, -2, -1, 3),
     ]
     assert get_maximal_score_for_restricted_calories(ingredients) == 57600000
+
+
+def test_get_maximal_scores():
+    ingredients = [
+        Ingredient("Butterscotch", -1, -2, 6, 3, 8),
+        Ingredient("Cinnamon", 2, 3, -2, -1, 3),
+    ]
+    assert get_maximal_scores(ingredients) == (62842880, 57600000)
+
+
+def test_get_maximal_scores_matches_enumeration():
+    ingredients = [
+        Ingredient("Sprinkles", 2, 0, -2, 0, 3),
+        Ingredient("Butterscotch", 0, 5, -3, 0, 3),
+        Ingredient("Chocolate", 0, 0, 5, -1, 8),
+        Ingredient("Candy", 0, -1, 0, 5, 8),
+    ]
+    amounts = [
+        [a, b, c, 20 - a - b - c]
+        for a in range(21)
+        for b in range(21 - a)
+        for c in range(21 - a - b)
+    ]
+    best = max(get_score(amount, ingredients) for amount in amounts)
+    restricted = max(
+        get_score(amount, ingredients)
+        for amount in amounts
+        if get_calories(amount, ingredients) == 100
+    )
+    assert get_maximal_scores(ingredients, 20, 100) == (best, restricted)
+
+
+def test_get_maximal_scores_at_scale():
+    ingredients = [
+        Ingredient("Sprinkles", -5, -4, -4, 0, 3),
+        Ingredient("Butterscotch", 6, 5, -1, -1, 4),
+        Ingredient("Chocolate", 4, -5, 4, 5, 3),
+        Ingredient("Candy", 1, 5, 1, 6, 9),
+        Ingredient("Frosting", 0, 3, 2, 3, 5),
+        Ingredient("Sugar", -5, -5, 0, 2, 6),
+        Ingredient("Cinnamon", 1, 1, 3, -3, 9),
+        Ingredient("Vanilla", -3, -2, -2, -5, 3),
+        Ingredient("Nutmeg", 0, -3, -3, 3, 9),
+        Ingredient("Caramel", 0, 3, 5, 3, 3),
+    ]
+    assert get_maximal_scores(ingredients, 1000, 5000) == (
+        51839347404690,
+        50302972185600,
+    )
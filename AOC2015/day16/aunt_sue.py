@@ -1,8 +1,19 @@
 import argparse
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, fields
 from pathlib import Path
 import re
 
+TICKER_TAPE = (
+    "children: 3, cats: 7, samoyeds: 2, pomeranians: 3, akitas: 0, "
+    "vizslas: 0, goldfish: 5, trees: 3, cars: 2, perfumes: 1"
+)
+RETROENCABULATOR = (
+    "children: 3, cats > 7, samoyeds: 2, pomeranians < 3, akitas: 0, "
+    "vizslas: 0, goldfish < 5, trees > 3, cars: 2, perfumes: 1"
+)
+PREDICATE_REGEX = r"\s*(\w+)\s*(:|=|<|>)\s*(-?\d+)\s*"
+
 
 @dataclass(frozen=True)
 class Aunt:
@@ -61,6 +72,146 @@ class Aunt:
         return Aunt(number, **attributes)
 
 
+@dataclass(frozen=True)
+class Predicate:
+    """
+    A remembered attribute of Aunt Sue compared against a reading,
+    e.g. "cats > 7" holds for every aunt with more than seven cats
+    """
+
+    attribute: str
+    operator: str
+    value: int
+
+    @staticmethod
+    def parse(text: str) -> "Predicate":
+        match = re.fullmatch(PREDICATE_REGEX, text)
+        if match is None:
+            raise ValueError(f"Invalid predicate: {text!r}")
+        attribute, operator, value = match.groups()
+        return Predicate(attribute, "=" if operator == ":" else operator, int(value))
+
+
+def parse_spec(text: str) -> list[Predicate]:
+    return [Predicate.parse(part) for part in text.split(",") if part.strip()]
+
+
+def _mask(rows: list[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _rows(mask: int) -> list[int]:
+    rows = []
+    bits = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(bits):
+        while byte:
+            lowest = byte & -byte
+            rows.append(8 * offset + lowest.bit_length() - 1)
+            byte ^= lowest
+    return rows
+
+
+class Column:
+    """
+    One attribute over all aunts: a posting list of rows per value,
+    the distinct values in sorted order with running row counts for
+    range predicates, and the rows where the attribute is not remembered
+    """
+
+    def __init__(self, values: list[int | None]):
+        self.size = len(values)
+        postings: dict[int, list[int]] = {}
+        unknown = []
+        known = []
+        for row, value in enumerate(values):
+            if value is None:
+                unknown.append(row)
+            else:
+                known.append(row)
+                postings.setdefault(value, []).append(row)
+        self.postings = postings
+        self.values = sorted(postings)
+        self.unknown = _mask(unknown, self.size)
+        self.unknown_count = len(unknown)
+        self.known = _mask(known, self.size)
+        # below_count[i] is the number of rows holding values[:i]
+        self.below_count = [0]
+        for value in self.values:
+            self.below_count.append(self.below_count[-1] + len(postings[value]))
+
+    def _span(self, operator: str, value: int) -> tuple[int, int]:
+        if operator == "=":
+            index = bisect_left(self.values, value)
+            found = index < len(self.values) and self.values[index] == value
+            return index, index + found
+        if operator == ">":
+            return bisect_right(self.values, value), len(self.values)
+        if operator == "<":
+            return 0, bisect_left(self.values, value)
+        raise ValueError(f"Unknown operator: {operator!r}")
+
+    def _rows_between(self, start: int, stop: int) -> list[int]:
+        return [
+            row for value in self.values[start:stop] for row in self.postings[value]
+        ]
+
+    def count(self, operator: str, value: int) -> int:
+        """
+        Number of rows that could still be Aunt Sue under the predicate
+        """
+        start, stop = self._span(operator, value)
+        return self.unknown_count + self.below_count[stop] - self.below_count[start]
+
+    def candidates(self, operator: str, value: int) -> int:
+        """
+        Bitmask of the same rows, built from whichever side of the
+        value range has fewer postings
+        """
+        start, stop = self._span(operator, value)
+        inside = self.below_count[stop] - self.below_count[start]
+        if 2 * inside <= self.below_count[-1]:
+            matching = _mask(self._rows_between(start, stop), self.size)
+        else:
+            outside = self._rows_between(0, start)
+            outside += self._rows_between(stop, len(self.values))
+            matching = self.known ^ _mask(outside, self.size)
+        return self.unknown | matching
+
+
+class AuntIndex:
+    """
+    Column store over many aunts answering specs without touching
+    each aunt, evaluating the most selective predicates first
+    """
+
+    def __init__(self, aunts: list[Aunt]):
+        self.numbers = [aunt.number for aunt in aunts]
+        self.columns = {
+            field.name: Column([getattr(aunt, field.name) for aunt in aunts])
+            for field in fields(Aunt)
+            if field.name != "number"
+        }
+
+    def query(self, spec: list[Predicate]) -> list[int]:
+        for predicate in spec:
+            if predicate.attribute not in self.columns:
+                raise ValueError(f"Unknown attribute: {predicate.attribute!r}")
+        ordered = sorted(
+            spec,
+            key=lambda p: self.columns[p.attribute].count(p.operator, p.value),
+        )
+        remaining = (1 << len(self.numbers)) - 1
+        for predicate in ordered:
+            column = self.columns[predicate.attribute]
+            remaining &= column.candidates(predicate.operator, predicate.value)
+            if not remaining:
+                return []
+        return [self.numbers[row] for row in _rows(remaining)]
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
@@ -68,25 +219,11 @@ def main():
 
     text = args.filename.read_text()
     aunts = [Aunt.parse(line) for line in text.splitlines()]
-    spec_aunt = Aunt(
-        0,
-        children=3,
-        cats=7,
-        samoyeds=2,
-        pomeranians=3,
-        akitas=0,
-        vizslas=0,
-        goldfish=5,
-        trees=3,
-        cars=2,
-        perfumes=1,
-    )
-    for aunt in aunts:
-        if aunt.matches_spec(spec_aunt):
-            print(aunt.number)
-    for aunt in aunts:
-        if aunt.actually_matches_spec(spec_aunt):
-            print(aunt.number)
+    index = AuntIndex(aunts)
+    for number in index.query(parse_spec(TICKER_TAPE)):
+        print(number)
+    for number in index.query(parse_spec(RETROENCABULATOR)):
+        print(number)
 
 
 if __name__ == "__main__":
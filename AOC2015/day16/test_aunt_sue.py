@@ -1,6 +1,36 @@
-from aunt_sue import Aunt
+from aunt_sue import Aunt, AuntIndex, Predicate, parse_spec
 
 
 def test_parse():
     text = "Sue 2: akitas: 10, perfumes: 10, children: 5"
     assert Aunt.parse(text) == Aunt(2, akitas=10, perfumes=10, children=5)
+
+
+def test_parse_spec():
+    assert parse_spec("cats > 7, trees: 3, goldfish<5") == [
+        Predicate("cats", ">", 7),
+        Predicate("trees", "=", 3),
+        Predicate("goldfish", "<", 5),
+    ]
+
+
+def test_query_equality():
+    aunts = [
+        Aunt(1, cats=7, trees=3),
+        Aunt(2, cats=8, cars=2),
+        Aunt(3, cars=2, perfumes=1),
+        Aunt(4, trees=4),
+    ]
+    index = AuntIndex(aunts)
+    assert index.query(parse_spec("cats: 7, trees: 3, cars: 2")) == [1, 3]
+
+
+def test_query_ranges():
+    aunts = [
+        Aunt(1, cats=7, goldfish=4),
+        Aunt(2, cats=8, goldfish=5),
+        Aunt(3, cats=9, goldfish=1),
+        Aunt(4, perfumes=1),
+    ]
+    index = AuntIndex(aunts)
+    assert index.query(parse_spec("cats > 7, goldfish < 5")) == [3, 4]
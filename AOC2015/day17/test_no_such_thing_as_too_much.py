@@ -1,4 +1,9 @@
-from no_such_thing_as_too_much import Box, combinations
+from no_such_thing_as_too_much import (
+    Box,
+    combinations,
+    count_combinations,
+    count_table,
+)
 
 
 def test_combinations():
@@ -10,3 +15,21 @@ def test_combinations():
         Box(5, 5),
     ]
     assert combinations(boxes, 25) == {2: 3, 3: 1}
+
+
+def test_count_table():
+    boxes = [Box(1, 20), Box(2, 15), Box(3, 10), Box(4, 5), Box(5, 5)]
+    table = count_table(boxes, 25)
+    assert table[25] == [0, 0, 3, 1, 0, 0]
+    assert table[5] == [0, 2, 0, 0, 0, 0]
+
+
+def test_count_combinations():
+    boxes = [Box(1, 20), Box(2, 15), Box(3, 10), Box(4, 5), Box(5, 5)]
+    assert count_combinations(boxes, 25, meet_in_the_middle=False) == {2: 3, 3: 1}
+    assert count_combinations(boxes, 25, meet_in_the_middle=True) == {2: 3, 3: 1}
+
+
+def test_count_combinations_many_boxes():
+    boxes = [Box(i, 1) for i in range(60)]
+    assert count_combinations(boxes, 2) == {2: 1770}
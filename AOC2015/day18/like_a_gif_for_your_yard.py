@@ -2,6 +2,11 @@ import argparse
 from pathlib import Path
 
 TURNS = 100
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+# Cell states for HashLife. Walls surround the yard and stuck lights
+# sit in its corners; neither ever changes.
+DEAD, ALIVE, WALL, STUCK = range(4)
 
 
 class Grid:
@@ -58,18 +63,295 @@ class Grid:
         return Grid(grid)
 
 
+class BitGrid:
+    """
+    The lights packed into a single integer, one bit per light.
+    Each row is followed by an empty guard bit so that shifting
+    by one column never wraps onto the neighbouring row.
+    """
+
+    def __init__(self, lights: int, rows: int, columns: int):
+        self.rows = rows
+        self.columns = columns
+        self.stride = columns + 1
+        row_mask = (1 << columns) - 1
+        self.mask = sum(row_mask << (r * self.stride) for r in range(rows))
+        self.lights = lights & self.mask
+        self.offsets = [dr * self.stride + dc for dr, dc in DIRECTIONS]
+
+    @staticmethod
+    def parse(text: str) -> "BitGrid":
+        return BitGrid.from_grid(Grid.parse(text))
+
+    @staticmethod
+    def from_grid(grid: Grid) -> "BitGrid":
+        stride = grid.columns + 1
+        lights = 0
+        for r_idx, row in enumerate(grid.grid):
+            for c_idx, value in enumerate(row):
+                if value:
+                    lights |= 1 << (r_idx * stride + c_idx)
+        return BitGrid(lights, grid.rows, grid.columns)
+
+    @property
+    def grid(self) -> list[list[bool]]:
+        rows = []
+        for r in range(self.rows):
+            row = self.lights >> (r * self.stride)
+            rows.append([bool(row >> c & 1) for c in range(self.columns)])
+        return rows
+
+    def _shift(self, board: int, offset: int) -> int:
+        """
+        Move the bit of the neighbour at offset onto each light
+        """
+        if offset > 0:
+            return (board >> offset) & self.mask
+        return (board << -offset) & self.mask
+
+    def evolve(self):
+        """
+        The eight shifted boards are summed with a bit-sliced
+        ripple-carry adder into four bit planes of the count
+        """
+        planes = [0, 0, 0, 0]
+        for offset in self.offsets:
+            carry = self._shift(self.lights, offset)
+            for i, plane in enumerate(planes):
+                if not carry:
+                    break
+                planes[i] = plane ^ carry
+                carry &= plane
+        ones, twos, fours, eights = planes
+        self.lights = twos & ~fours & ~eights & (ones | self.lights) & self.mask
+
+    def count_on(self) -> int:
+        return self.lights.bit_count()
+
+    def turn_on_corners(self):
+        if not self.rows or not self.columns:
+            return
+        last_row = (self.rows - 1) * self.stride
+        for position in (0, self.columns - 1, last_row, last_row + self.columns - 1):
+            self.lights |= 1 << position
+
+
+class Node:
+    """
+    A square of 2^level cells in a HashLife quadtree. Nodes are
+    interned, so equal squares are the same object and share the
+    cache of their evolved centres.
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "results")
+
+    def __init__(self, level: int, nw, ne, sw, se, population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+        self.results: dict[int, "Node"] = {}
+
+
+class HashLife:
+    """
+    The yard as a memoised quadtree inside an ever larger square of
+    walls. Advancing a node of level k by up to 2^(k - 2) generations
+    yields its centre, so long runs take a number of steps logarithmic
+    in their length once the lights settle into repeating patterns.
+    """
+
+    def __init__(self, grid: list[list[bool]], stuck_corners: bool = False):
+        self.rows = len(grid)
+        self.columns = len(grid[0]) if self.rows else 0
+        self._nodes: dict[tuple, Node] = {}
+        self._walls: list = [WALL]
+        cells = [[ALIVE if value else DEAD for value in row] for row in grid]
+        if stuck_corners and self.rows and self.columns:
+            for r, c in ((0, 0), (0, -1), (-1, 0), (-1, -1)):
+                cells[r][c] = STUCK
+        level = 2
+        while 1 << level < max(self.rows, self.columns):
+            level += 1
+        size = 1 << level
+        squares = [
+            [
+                cells[r][c] if r < self.rows and c < self.columns else WALL
+                for c in range(size)
+            ]
+            for r in range(size)
+        ]
+        while size > 1:
+            size //= 2
+            squares = [
+                [
+                    self._join(
+                        squares[2 * r][2 * c],
+                        squares[2 * r][2 * c + 1],
+                        squares[2 * r + 1][2 * c],
+                        squares[2 * r + 1][2 * c + 1],
+                    )
+                    for c in range(size)
+                ]
+                for r in range(size)
+            ]
+        self.root = squares[0][0]
+        # Where the top left of the yard sits inside the root
+        self.origin = 0
+
+    @staticmethod
+    def parse(text: str, stuck_corners: bool = False) -> "HashLife":
+        return HashLife(Grid.parse(text).grid, stuck_corners)
+
+    def _join(self, nw, ne, sw, se) -> Node:
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            if isinstance(nw, Node):
+                level = nw.level + 1
+                population = nw.population + ne.population
+                population += sw.population + se.population
+            else:
+                level = 1
+                population = sum(cell in (ALIVE, STUCK) for cell in key)
+            node = Node(level, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def _wall(self, level: int):
+        while len(self._walls) <= level:
+            wall = self._walls[-1]
+            self._walls.append(self._join(wall, wall, wall, wall))
+        return self._walls[level]
+
+    def _expand(self, node: Node) -> Node:
+        """
+        The node in the middle of a square of walls twice its size
+        """
+        wall = self._wall(node.level - 1)
+        return self._join(
+            self._join(wall, wall, wall, node.nw),
+            self._join(wall, wall, node.ne, wall),
+            self._join(wall, node.sw, wall, wall),
+            self._join(node.se, wall, wall, wall),
+        )
+
+    def _centre(self, node: Node) -> Node:
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    @staticmethod
+    def _step_cells(node: Node) -> list[int]:
+        """
+        The four centre cells of a 4x4 node one generation later
+        """
+        cells = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        centre = []
+        for r in (1, 2):
+            for c in (1, 2):
+                cell = cells[r][c]
+                if cell in (DEAD, ALIVE):
+                    count = sum(
+                        cells[r + dr][c + dc] in (ALIVE, STUCK) for dr, dc in DIRECTIONS
+                    )
+                    alive = count == 3 or (cell == ALIVE and count == 2)
+                    cell = ALIVE if alive else DEAD
+                centre.append(cell)
+        return centre
+
+    def _advance(self, node: Node, step: int) -> Node:
+        """
+        The centre of the node 2^step generations later, step <= level - 2
+        """
+        result = node.results.get(step)
+        if result is not None:
+            return result
+        if node.level == 2:
+            result = self._join(*self._step_cells(node))
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            overlapping = [
+                nw,
+                self._join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self._join(nw.sw, nw.se, sw.nw, sw.ne),
+                self._centre(node),
+                self._join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self._join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+            remaining = step
+            if step == node.level - 2:
+                # Half of the generations now, the other half below
+                remaining = step - 1
+                parts = [self._advance(part, remaining) for part in overlapping]
+            else:
+                parts = [self._centre(part) for part in overlapping]
+            quarters = [
+                self._join(parts[i], parts[i + 1], parts[i + 3], parts[i + 4])
+                for i in (0, 1, 3, 4)
+            ]
+            result = self._join(*(self._advance(q, remaining) for q in quarters))
+        node.results[step] = result
+        return result
+
+    def evolve(self, generations: int = 1):
+        step = 0
+        while generations:
+            if generations & 1:
+                while self.root.level < step + 2:
+                    self.origin += 1 << (self.root.level - 1)
+                    self.root = self._expand(self.root)
+                self.root = self._advance(self._expand(self.root), step)
+            generations >>= 1
+            step += 1
+
+    def count_on(self) -> int:
+        return self.root.population
+
+    @property
+    def grid(self) -> list[list[bool]]:
+        return [
+            [self._cell(r, c) in (ALIVE, STUCK) for c in range(self.columns)]
+            for r in range(self.rows)
+        ]
+
+    def _cell(self, row: int, column: int) -> int:
+        row += self.origin
+        column += self.origin
+        node = self.root
+        size = 1 << node.level
+        while isinstance(node, Node):
+            size //= 2
+            north, west = row < size, column < size
+            if north:
+                node = node.nw if west else node.ne
+            else:
+                node = node.sw if west else node.se
+            row %= size
+            column %= size
+        return node
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
     args = parser.parse_args()
 
     text = args.filename.read_text()
-    grid = Grid.parse(text)
+    grid = BitGrid.parse(text)
     for _ in range(TURNS):
         grid.evolve()
     print(grid.count_on())
 
-    grid = Grid.parse(text)
+    grid = BitGrid.parse(text)
     for _ in range(TURNS):
         grid.turn_on_corners()
         grid.evolve()
@@ -1,4 +1,4 @@
-from like_a_gif_for_your_yard import Grid
+from like_a_gif_for_your_yard import BitGrid, Grid, HashLife
 
 
 def test_parse():
@@ -19,3 +19,83 @@ def test_evolve_grid():
         print(grid.count_on())
         grid.evolve()
     assert grid.count_on() == 4
+
+
+def test_bit_grid_matches_grid():
+    text = """.#.#.#
+              ...##.
+              #....#
+              ..#...
+              #.#..#
+              ####.."""
+    grid = Grid.parse(text)
+    bit_grid = BitGrid.parse(text)
+    assert bit_grid.grid == grid.grid
+    for _ in range(4):
+        grid.evolve()
+        bit_grid.evolve()
+        assert bit_grid.grid == grid.grid
+    assert bit_grid.count_on() == 4
+
+
+def test_bit_grid_stuck_corners():
+    text = """##.#.#
+              ...##.
+              #....#
+              ..#...
+              #.#..#
+              ####.#"""
+    grid = BitGrid.parse(text)
+    for _ in range(5):
+        grid.turn_on_corners()
+        grid.evolve()
+    grid.turn_on_corners()
+    assert grid.count_on() == 17
+
+
+def test_hash_life():
+    text = """.#.#.#
+              ...##.
+              #....#
+              ..#...
+              #.#..#
+              ####.."""
+    grid = HashLife.parse(text)
+    grid.evolve(4)
+    assert grid.count_on() == 4
+    assert grid.grid == [
+        [False] * 6,
+        [False] * 6,
+        [False, False, True, True, False, False],
+        [False, False, True, True, False, False],
+        [False] * 6,
+        [False] * 6,
+    ]
+
+
+def test_hash_life_stuck_corners():
+    text = """##.#.#
+              ...##.
+              #....#
+              ..#...
+              #.#..#
+              ####.#"""
+    grid = HashLife.parse(text, stuck_corners=True)
+    grid.evolve(5)
+    assert grid.count_on() == 17
+
+
+def test_hash_life_long_run():
+    text = """.....
+              ..#..
+              ..#..
+              ..#..
+              ....."""
+    expected = """.....
+                  .....
+                  .###.
+                  .....
+                  ....."""
+    grid = HashLife.parse(text)
+    grid.evolve(10**6 + 1)
+    assert grid.grid == Grid.parse(expected).grid
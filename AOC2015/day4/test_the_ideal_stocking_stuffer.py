@@ -1,4 +1,8 @@
-from the_ideal_stocking_stuffer import check_attempt, minimum_with_leading_zeroes
+from the_ideal_stocking_stuffer import (
+    check_attempt,
+    mine_with_leading_zeroes,
+    minimum_with_leading_zeroes,
+)
 
 
 def test_check_attempt():
@@ -11,3 +15,10 @@ def test_minimum_with_leading_zeros():
     assert minimum_with_leading_zeroes(prefix, 5) == 609043
     prefix = "pqrstuv"
     assert minimum_with_leading_zeroes(prefix, 5) == 1048970
+
+
+def test_mine_with_leading_zeros():
+    assert mine_with_leading_zeroes("abcdef", 5, workers=2, block_size=50_000) == 609043
+    assert mine_with_leading_zeroes("pqrstuv", 5, workers=2) == 1048970
+    minimum = minimum_with_leading_zeroes("abcdef", 1)
+    assert mine_with_leading_zeroes("abcdef", 1, workers=2) == minimum
@@ -1,4 +1,7 @@
 import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from hashlib import md5
 
 
@@ -19,11 +22,61 @@ def check_attempt(prefix: str, attempt_num: int, zeroes: int) -> bool:
     return True
 
 
+def _search_block(prefix: str, zeroes: int, start: int, stop: int) -> int | None:
+    """
+    Smallest attempt in [start, stop) with enough leading zeroes.
+    The prefix is hashed once and its state copied per attempt,
+    and the leading nibbles of the raw digest are checked with a mask.
+    """
+    base = md5(prefix.encode())
+    length = (zeroes + 1) // 2
+    mask = ((1 << (4 * zeroes)) - 1) << (8 * length - 4 * zeroes)
+    for attempt_num in range(start, stop):
+        h = base.copy()
+        h.update(str(attempt_num).encode())
+        if not int.from_bytes(h.digest()[:length], "big") & mask:
+            return attempt_num
+    return None
+
+
+def mine_with_leading_zeroes(
+    prefix: str, zeroes: int, workers: int | None = None, block_size: int = 100_000
+) -> int:
+    """
+    Split the attempts into blocks searched across a process pool.
+    Blocks are collected in order, so the first block with a match
+    holds the smallest attempt, as every earlier block had none.
+    """
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        start = 1
+        while True:
+            while len(pending) < window:
+                pending.append(
+                    executor.submit(
+                        _search_block, prefix, zeroes, start, start + block_size
+                    )
+                )
+                start += block_size
+            found = pending.popleft().result()
+            if found is not None:
+                for future in pending:
+                    future.cancel()
+                return found
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("input")
+    parser.add_argument("--workers", type=int)
     args = parser.parse_args()
 
+    if args.workers:
+        print(mine_with_leading_zeroes(args.input, 5, args.workers))
+        print(mine_with_leading_zeroes(args.input, 6, args.workers))
+        return
+
     minimum_with_5 = minimum_with_leading_zeroes(args.input, 5)
     print(minimum_with_5)
     minimum_with_6 = minimum_with_leading_zeroes(args.input, 6)
@@ -1,8 +1,19 @@
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+import re
 
 VOWELS = "aeiou"
 DISALLOWED = [("a", "b"), ("c", "d"), ("p", "q"), ("x", "y")]
+CHUNK_SIZE = 1 << 24
+
+# Byte level tables for checking whole lines at once
+NOT_VOWELS = bytes(sorted(set(range(256)) - set(VOWELS.encode())))
+DISALLOWED_PAIRS = [(a + b).encode() for a, b in DISALLOWED]
+DOUBLE_REGEX = re.compile(rb"(.)\1")
+GAPPED_REPEAT_REGEX = re.compile(rb"(.).\1")
+DOUBLE_PAIR_REGEX = re.compile(rb"(..).*\1")
 
 
 def is_nice(text: str) -> bool:
@@ -31,16 +42,72 @@ def is_actually_nice(text: str) -> bool:
     return has_gapped_repeat and has_double_pair
 
 
+def count_nice(data: bytes) -> tuple[int, int]:
+    """
+    Lines of the data that are nice and actually nice, checked
+    together in one pass without decoding
+    """
+    nice = actually_nice = 0
+    for line in data.splitlines():
+        if (
+            len(line.translate(None, NOT_VOWELS)) >= 3
+            and not any(pair in line for pair in DISALLOWED_PAIRS)
+            and DOUBLE_REGEX.search(line)
+        ):
+            nice += 1
+        if GAPPED_REPEAT_REGEX.search(line) and DOUBLE_PAIR_REGEX.search(line):
+            actually_nice += 1
+    return nice, actually_nice
+
+
+def _chunks(path: Path, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Byte ranges of about chunk_size, each ending just after a newline
+    """
+    size = path.stat().st_size
+    chunks = []
+    start = 0
+    with path.open("rb") as file:
+        while start < size:
+            file.seek(start + chunk_size)
+            file.readline()
+            end = min(file.tell(), size)
+            chunks.append((start, end))
+            start = end
+    return chunks
+
+
+def _count_nice_range(path: Path, chunk: tuple[int, int]) -> tuple[int, int]:
+    start, end = chunk
+    with path.open("rb") as file:
+        file.seek(start)
+        return count_nice(file.read(end - start))
+
+
+def count_nice_file(
+    path: Path, workers: int | None = None, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, int]:
+    """
+    count_nice over a file read in chunks, spread over a process pool
+    when workers are given
+    """
+    chunks = _chunks(path, chunk_size)
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            counts = list(executor.map(_count_nice_range, repeat(path), chunks))
+    else:
+        counts = [_count_nice_range(path, chunk) for chunk in chunks]
+    return sum(n for n, _ in counts), sum(a for _, a in counts)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
+    parser.add_argument("--workers", type=int)
     args = parser.parse_args()
 
-    text = args.filename.read_text()
-    total_nice = sum(is_nice(x) for x in text.splitlines())
+    total_nice, total_actually_nice = count_nice_file(args.filename, args.workers)
     print(total_nice)
-
-    total_actually_nice = sum(is_actually_nice(x) for x in text.splitlines())
     print(total_actually_nice)
 
 
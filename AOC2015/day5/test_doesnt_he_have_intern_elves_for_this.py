@@ -1,4 +1,21 @@
-from doesnt_he_have_intern_elves_for_this import is_actually_nice, is_nice
+from doesnt_he_have_intern_elves_for_this import (
+    count_nice,
+    count_nice_file,
+    is_actually_nice,
+    is_nice,
+)
+
+LINES = [
+    "ugknbfddgicrmopn",
+    "aaa",
+    "jchzalrnumimnmhp",
+    "haegwjzuvuyypxyu",
+    "dvszwmarrgswjxmb",
+    "qjhvhtzxzqqjkmpb",
+    "xxyxx",
+    "uurcxstgmygtbstg",
+    "ieodomkazucvgmuy",
+]
 
 
 def test_is_nice():
@@ -14,3 +31,15 @@ def test_is_actually_nice():
     assert is_actually_nice("xxyxx")
     assert not is_actually_nice("uurcxstgmygtbstg")
     assert not is_actually_nice("ieodomkazucvgmuy")
+
+
+def test_count_nice():
+    data = "\n".join(LINES).encode()
+    assert count_nice(data) == (2, 2)
+
+
+def test_count_nice_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(LINES) + "\n")
+    assert count_nice_file(path, chunk_size=10) == (2, 2)
+    assert count_nice_file(path, workers=2, chunk_size=10) == (2, 2)
@@ -4,6 +4,135 @@ from pathlib import Path
 import re
 
 INSTRUCTION_REGEX = r"(turn on|toggle|turn off) (\d+),(\d+) through (\d+),(\d+)"
+SIZE = 1000
+
+
+def _spread(bits: int, count: int, stride: int) -> int:
+    """
+    Move bit i of the lowest count bits to bit i * stride
+    """
+    if count <= 64:
+        result = 0
+        for i in range(count):
+            if bits >> i & 1:
+                result |= 1 << (i * stride)
+        return result
+    half = count // 2
+    low = _spread(bits & ((1 << half) - 1), half, stride)
+    high = _spread(bits >> half, count - half, stride)
+    return low | high << (half * stride)
+
+
+class SlabGrid:
+    """
+    Lights over the cells between consecutive row and column edges,
+    all packed row by row into one integer per bit of brightness.
+    Every instruction is then a handful of whole-board integer
+    operations on the mask of its rectangle.
+    """
+
+    def __init__(self, row_edges: list[int], column_edges: list[int]):
+        self.rows = len(row_edges) - 1
+        self.columns = len(column_edges) - 1
+        self.row_index = {edge: i for i, edge in enumerate(row_edges)}
+        self.column_index = {edge: i for i, edge in enumerate(column_edges)}
+        self.heights = [b - a for a, b in zip(row_edges, row_edges[1:])]
+        self.widths = [b - a for a, b in zip(column_edges, column_edges[1:])]
+        self.planes = [0]
+
+    @staticmethod
+    def dense(size: int = SIZE) -> "SlabGrid":
+        return SlabGrid(list(range(size + 1)), list(range(size + 1)))
+
+    @staticmethod
+    def compressed(instructions: list["Instruction"]) -> "SlabGrid":
+        """
+        Only the edges of the instructions' rectangles, so the grid
+        grows with the number of instructions rather than their extent
+        """
+        rows = {x for i in instructions for x in (i.start[0], i.end[0] + 1)}
+        columns = {x for i in instructions for x in (i.start[1], i.end[1] + 1)}
+        return SlabGrid(sorted(rows), sorted(columns))
+
+    def rectangle(self, start: tuple[int, int], end: tuple[int, int]) -> int:
+        top = self.row_index[start[0]]
+        height = self.row_index[end[0] + 1] - top
+        left = self.column_index[start[1]]
+        width = self.column_index[end[1] + 1] - left
+        # One bit at the start of each row, then a run of width ones from each
+        starts = _spread((1 << height) - 1, height, self.columns)
+        return ((starts << (left + width)) - (starts << left)) << (top * self.columns)
+
+    def _lit(self) -> int:
+        lit = 0
+        for plane in self.planes:
+            lit |= plane
+        return lit
+
+    def _clear(self, mask: int):
+        self.planes = [plane & ~mask for plane in self.planes]
+
+    def turn_on(self, mask: int):
+        self._clear(mask)
+        self.planes[0] |= mask
+
+    def turn_off(self, mask: int):
+        self._clear(mask)
+
+    def toggle(self, mask: int):
+        off = mask & ~self._lit()
+        self._clear(mask)
+        self.planes[0] |= off
+
+    def brighten(self, mask: int, amount: int):
+        level = 0
+        while amount:
+            if amount & 1:
+                carry = mask
+                index = level
+                while carry:
+                    if index == len(self.planes):
+                        self.planes.append(0)
+                    plane = self.planes[index]
+                    self.planes[index] = plane ^ carry
+                    carry &= plane
+                    index += 1
+            amount >>= 1
+            level += 1
+
+    def dim(self, mask: int):
+        borrow = mask & self._lit()
+        index = 0
+        while borrow:
+            plane = self.planes[index]
+            self.planes[index] = plane ^ borrow
+            borrow &= ~plane
+            index += 1
+
+    def total(self) -> int:
+        """
+        Brightness summed over the area of every cell. Heights and
+        widths are split into their binary digits, so each digit pair
+        is one masked popcount per plane.
+        """
+        all_rows = _spread((1 << self.rows) - 1, self.rows, self.columns)
+        row_masks = []
+        for bit in range(max(self.heights, default=0).bit_length()):
+            chosen = sum(1 << r for r, h in enumerate(self.heights) if h >> bit & 1)
+            starts = _spread(chosen, self.rows, self.columns)
+            row_masks.append((starts << self.columns) - starts)
+        column_masks = []
+        for bit in range(max(self.widths, default=0).bit_length()):
+            chosen = sum(1 << c for c, w in enumerate(self.widths) if w >> bit & 1)
+            column_masks.append(chosen * all_rows)
+        total = 0
+        for level, plane in enumerate(self.planes):
+            for row_bit, rows in enumerate(row_masks):
+                selected = plane & rows
+                for column_bit, columns in enumerate(column_masks):
+                    count = (selected & columns).bit_count()
+                    total += count << (level + row_bit + column_bit)
+        return total
 
 
 @dataclass
@@ -16,6 +145,9 @@ class Instruction:
             for column_index in range(self.start[1], self.end[1] + 1):
                 grid[row_index][column_index] = operation(grid[row_index][column_index])
 
+    def rectangle(self, grid: SlabGrid) -> int:
+        return grid.rectangle(self.start, self.end)
+
 
 @dataclass
 class ToggleInstruction(Instruction):
@@ -25,6 +157,12 @@ class ToggleInstruction(Instruction):
     def alternate_apply(self, grid: list[list[int]]):
         self.apply_per_cell(grid, lambda x: x + 2)
 
+    def apply_slab(self, grid: SlabGrid):
+        grid.toggle(self.rectangle(grid))
+
+    def alternate_apply_slab(self, grid: SlabGrid):
+        grid.brighten(self.rectangle(grid), 2)
+
 
 @dataclass
 class TurnOffInstruction(Instruction):
@@ -34,6 +172,12 @@ class TurnOffInstruction(Instruction):
     def alternate_apply(self, grid: list[list[int]]):
         self.apply_per_cell(grid, lambda x: max(0, x - 1))
 
+    def apply_slab(self, grid: SlabGrid):
+        grid.turn_off(self.rectangle(grid))
+
+    def alternate_apply_slab(self, grid: SlabGrid):
+        grid.dim(self.rectangle(grid))
+
 
 @dataclass
 class TurnOnInstruction(Instruction):
@@ -43,6 +187,12 @@ class TurnOnInstruction(Instruction):
     def alternate_apply(self, grid: list[list[int]]):
         self.apply_per_cell(grid, lambda x: x + 1)
 
+    def apply_slab(self, grid: SlabGrid):
+        grid.turn_on(self.rectangle(grid))
+
+    def alternate_apply_slab(self, grid: SlabGrid):
+        grid.brighten(self.rectangle(grid), 1)
+
 
 def parse_instruction(text: str) -> Instruction:
     matched = re.match(INSTRUCTION_REGEX, text)
@@ -65,18 +215,16 @@ def main():
     args = parser.parse_args()
 
     text = args.filename.read_text()
-    grid = [[0 for _ in range(1000)] for _ in range(1000)]
     instructions = [parse_instruction(x) for x in text.splitlines()]
+    grid = SlabGrid.dense()
     for instruction in instructions:
-        instruction.apply(grid)
-    total_on = sum(grid[r][c] for r in range(1000) for c in range(1000))
-    print(total_on)
+        instruction.apply_slab(grid)
+    print(grid.total())
 
-    grid = [[0 for _ in range(1000)] for _ in range(1000)]
+    grid = SlabGrid.dense()
     for instruction in instructions:
-        instruction.alternate_apply(grid)
-    total_brightness = sum(grid[r][c] for r in range(1000) for c in range(1000))
-    print(total_brightness)
+        instruction.alternate_apply_slab(grid)
+    print(grid.total())
 
 
 if __name__ == "__main__":
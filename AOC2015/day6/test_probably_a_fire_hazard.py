@@ -1,4 +1,8 @@
-from probably_a_fire_hazard import parse_instruction, TurnOnInstruction
+from probably_a_fire_hazard import (
+    parse_instruction,
+    SlabGrid,
+    TurnOnInstruction,
+)
 
 
 def test_parse():
@@ -7,3 +11,43 @@ def test_parse():
     assert isinstance(parsed, TurnOnInstruction)
     assert parsed.start == (0, 0)
     assert parsed.end == (999, 999)
+
+
+def test_slab_grid():
+    instructions = [
+        parse_instruction("turn on 0,0 through 999,999"),
+        parse_instruction("toggle 0,0 through 999,0"),
+        parse_instruction("turn off 499,499 through 500,500"),
+    ]
+    grid = SlabGrid.dense()
+    for instruction in instructions:
+        instruction.apply_slab(grid)
+    assert grid.total() == 1000000 - 1000 - 4
+
+
+def test_slab_grid_brightness():
+    instructions = [
+        parse_instruction("turn on 0,0 through 0,0"),
+        parse_instruction("toggle 0,0 through 999,999"),
+        parse_instruction("turn off 0,0 through 1,1"),
+    ]
+    grid = SlabGrid.dense()
+    for instruction in instructions:
+        instruction.alternate_apply_slab(grid)
+    assert grid.total() == 1 + 2000000 - 4
+
+
+def test_compressed_slab_grid():
+    instructions = [
+        parse_instruction("turn on 0,0 through 999999,999999"),
+        parse_instruction("toggle 0,0 through 999999,0"),
+        parse_instruction("turn off 499,499 through 500,500"),
+    ]
+    grid = SlabGrid.compressed(instructions)
+    for instruction in instructions:
+        instruction.apply_slab(grid)
+    assert grid.total() == 10**12 - 10**6 - 4
+    grid = SlabGrid.compressed(instructions)
+    for instruction in instructions:
+        instruction.alternate_apply_slab(grid)
+    assert grid.total() == 10**12 + 2 * 10**6 - 4
@@ -1,9 +1,11 @@
 import argparse
+from array import array
 from dataclasses import dataclass
+import heapq
 from pathlib import Path
 import re
 
-
+MASK = 2**16 - 1
 SETTER_REGEX = r"(\w+) -> (\w+)"
 NOT_REGEX = r"NOT (\w+) -> (\w+)"
 BINARY_REGEX = r"(\w+) (\w+) (\w+) -> (\w+)"
@@ -19,6 +21,13 @@ class Instruction:
     def can_resolve(self, registry: dict[str, int]) -> bool:
         return False
 
+    @property
+    def inputs(self) -> list[str | int]:
+        return []
+
+    def compute(self, left: int, right: int) -> int:
+        return 0
+
     def _get_value(self, x: str | int, registry: dict[str, int]) -> int:
         return registry[x] if isinstance(x, str) else x
 
@@ -33,6 +42,10 @@ class UnaryInstruction(Instruction):
     def can_resolve(self, registry: dict[str, int]) -> bool:
         return self._is_value_resolved(self.value, registry)
 
+    @property
+    def inputs(self) -> list[str | int]:
+        return [self.value]
+
 
 @dataclass
 class BinaryInstruction(Instruction):
@@ -44,18 +57,28 @@ class BinaryInstruction(Instruction):
             self.right, registry
         )
 
+    @property
+    def inputs(self) -> list[str | int]:
+        return [self.left, self.right]
+
 
 @dataclass
 class SetInstruction(UnaryInstruction):
     def apply(self, registry: dict[str, int]):
         registry[self.target] = self._get_value(self.value, registry)
 
+    def compute(self, left: int, right: int) -> int:
+        return left
+
 
 @dataclass
 class NotInstruction(UnaryInstruction):
     def apply(self, registry: dict[str, int]):
         registry[self.target] = self._get_value(self.value, registry) ^ (2**16 - 1)
 
+    def compute(self, left: int, right: int) -> int:
+        return left ^ MASK
+
 
 @dataclass
 class AndInstruction(BinaryInstruction):
@@ -64,6 +87,9 @@ class AndInstruction(BinaryInstruction):
         right_value = self._get_value(self.right, registry)
         registry[self.target] = (left_value & right_value) & (2**16 - 1)
 
+    def compute(self, left: int, right: int) -> int:
+        return left & right
+
 
 @dataclass
 class OrInstruction(BinaryInstruction):
@@ -72,6 +98,9 @@ class OrInstruction(BinaryInstruction):
         right_value = self._get_value(self.right, registry)
         registry[self.target] = (left_value | right_value) & (2**16 - 1)
 
+    def compute(self, left: int, right: int) -> int:
+        return left | right
+
 
 @dataclass
 class LShiftInstruction(BinaryInstruction):
@@ -80,6 +109,9 @@ class LShiftInstruction(BinaryInstruction):
         right_value = self._get_value(self.right, registry)
         registry[self.target] = (left_value << right_value) & (2**16 - 1)
 
+    def compute(self, left: int, right: int) -> int:
+        return (left << right) & MASK
+
 
 @dataclass
 class RShiftInstruction(BinaryInstruction):
@@ -88,6 +120,9 @@ class RShiftInstruction(BinaryInstruction):
         right_value = self._get_value(self.right, registry)
         registry[self.target] = (left_value >> right_value) & (2**16 - 1)
 
+    def compute(self, left: int, right: int) -> int:
+        return left >> right
+
 
 def _int_or_value(x: str) -> int | str:
     try:
@@ -146,24 +181,157 @@ def resolve(instructions: list[Instruction]) -> dict[str, int]:
     return registry
 
 
+class Circuit:
+    """
+    The instructions compiled once into gates over numbered wires,
+    ranked in topological order, with every signal in a flat array.
+    Constants get wires of their own. Gates on a cycle or downstream
+    of a wire without a signal stay unresolved, as with resolve.
+    """
+
+    def __init__(self, instructions: list[Instruction]):
+        self.wires: dict[str | int, int] = {}
+        self.gates = []
+        self.driver: dict[int, int] = {}
+        for instruction in instructions:
+            operands = [self._wire(x) for x in instruction.inputs]
+            if len(operands) == 1:
+                operands.append(operands[0])
+            target = self._wire(instruction.target)
+            self.driver[target] = len(self.gates)
+            self.gates.append((instruction.compute, target, *operands))
+        # Only the last instruction driving a wire counts
+        live = sorted(set(self.driver.values()))
+        self.consumers: list[list[int]] = [[] for _ in self.wires]
+        self.sources: list[list[int]] = [[] for _ in self.gates]
+        for gate in live:
+            for wire in set(self.gates[gate][2:]):
+                self.consumers[wire].append(gate)
+                if wire in self.driver:
+                    self.sources[gate].append(self.driver[wire])
+        self.values = array("H", [0]) * len(self.wires)
+        self.resolved = bytearray(len(self.wires))
+        for name, wire in self.wires.items():
+            if isinstance(name, int):
+                self.values[wire] = name & MASK
+                self.resolved[wire] = 1
+        self.rank = [-1] * len(self.gates)
+        self.held: set[int] = set()
+        self.order = self._topological_order(live)
+        for gate in self.order:
+            self._evaluate(gate)
+
+    def _wire(self, name: str | int) -> int:
+        if name not in self.wires:
+            self.wires[name] = len(self.wires)
+        return self.wires[name]
+
+    def _topological_order(self, live: list[int]) -> list[int]:
+        """
+        Gates in Kahn's order, then whatever is left on or below a
+        cycle in depth first post order over their inputs. A gate fed
+        from one ranked no earlier closes a cycle, so it is held
+        unresolved and the rest of its cycle follows from it.
+        """
+        waiting = [len(sources) for sources in self.sources]
+        order = [gate for gate in live if not waiting[gate]]
+        for gate in order:
+            for consumer in self.consumers[self.gates[gate][1]]:
+                waiting[consumer] -= 1
+                if not waiting[consumer]:
+                    order.append(consumer)
+        seen = bytearray(len(self.gates))
+        for gate in order:
+            seen[gate] = 1
+        acyclic = len(order)
+        for root in live:
+            if seen[root]:
+                continue
+            seen[root] = 1
+            stack = [(root, iter(self.sources[root]))]
+            while stack:
+                gate, sources = stack[-1]
+                for source in sources:
+                    if not seen[source]:
+                        seen[source] = 1
+                        stack.append((source, iter(self.sources[source])))
+                        break
+                else:
+                    stack.pop()
+                    order.append(gate)
+        for position, gate in enumerate(order):
+            self.rank[gate] = position
+        for gate in order[acyclic:]:
+            if any(self.rank[s] >= self.rank[gate] for s in self.sources[gate]):
+                self.held.add(gate)
+        return order
+
+    def _evaluate(self, gate: int) -> bool:
+        """
+        Recompute the gate, telling whether its output changed
+        """
+        compute, target, left, right = self.gates[gate]
+        resolved = self.resolved[left] & self.resolved[right] & (gate not in self.held)
+        value = compute(self.values[left], self.values[right]) if resolved else 0
+        changed = value != self.values[target] or resolved != self.resolved[target]
+        self.values[target] = value
+        self.resolved[target] = resolved
+        return changed
+
+    def get(self, wire: str) -> int | None:
+        index = self.wires.get(wire)
+        if index is None or not self.resolved[index]:
+            return None
+        return self.values[index]
+
+    def registry(self) -> dict[str, int]:
+        return {
+            name: self.values[wire]
+            for name, wire in self.wires.items()
+            if isinstance(name, str) and self.resolved[wire]
+        }
+
+    def override(self, wire: str, value: int):
+        """
+        Cut the wire from its driver and hold it at the value, then
+        recompute the gates downstream in rank order, going no further
+        than the outputs that actually change. Gates held on a cycle
+        stay unresolved even if the override cuts it.
+        """
+        index = self._wire(wire)
+        if index == len(self.consumers):
+            self.consumers.append([])
+            self.values.append(0)
+            self.resolved.append(0)
+        self.driver.pop(index, None)
+        self.values[index] = value & MASK
+        self.resolved[index] = 1
+        queue = [(self.rank[gate], gate) for gate in self.consumers[index]]
+        heapq.heapify(queue)
+        queued = set(self.consumers[index])
+        while queue:
+            rank, gate = heapq.heappop(queue)
+            if rank < 0 or self.driver.get(self.gates[gate][1]) != gate:
+                continue
+            if self._evaluate(gate):
+                for consumer in self.consumers[self.gates[gate][1]]:
+                    if consumer not in queued:
+                        queued.add(consumer)
+                        heapq.heappush(queue, (self.rank[consumer], consumer))
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
     args = parser.parse_args()
 
     text = args.filename.read_text()
-    instructions = read_instructions(text)
-    registry = resolve(instructions)
-    print(registry["a"])
-
-    new_instruction = SetInstruction(target="b", value=registry["a"])
-    for i, instruction in enumerate(instructions):
-        if instruction.target == "b":
-            break
-    instructions.pop(i)
-    instructions.append(new_instruction)
-    new_registry = resolve(instructions)
-    print(new_registry["a"])
+    circuit = Circuit(read_instructions(text))
+    signal = circuit.get("a")
+    print(signal)
+
+    circuit.override("b", signal)
+    print(circuit.get("a"))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from some_assembly_required import read_instructions, resolve
+from some_assembly_required import Circuit, read_instructions, resolve
 
 
 def test_resolution():
@@ -22,3 +22,46 @@ def test_resolution():
         "x": 123,
         "y": 456,
     }
+
+
+def test_circuit():
+    text = """x AND y -> d
+    d LSHIFT 1 -> e
+    123 -> x
+    NOT x -> h
+    456 -> y"""
+    instructions = read_instructions(text)
+    circuit = Circuit(instructions)
+    assert circuit.registry() == resolve(instructions)
+    assert circuit.get("e") == 144
+    assert circuit.get("h") == 65412
+    assert circuit.get("z") is None
+
+
+def test_circuit_override():
+    text = """123 -> x
+    456 -> y
+    x AND y -> d
+    x OR y -> e
+    NOT x -> h"""
+    circuit = Circuit(read_instructions(text))
+    circuit.override("x", 0)
+    assert circuit.registry() == {
+        "d": 0,
+        "e": 456,
+        "h": 65535,
+        "x": 0,
+        "y": 456,
+    }
+
+
+def test_circuit_unresolved():
+    text = """a OR b -> c
+    c -> d
+    e AND f -> f
+    f -> g"""
+    circuit = Circuit(read_instructions(text))
+    assert circuit.registry() == {}
+    circuit.override("a", 1)
+    circuit.override("b", 2)
+    assert circuit.registry() == {"a": 1, "b": 2, "c": 3, "d": 3}
@@ -1,6 +1,9 @@
 import argparse
+import mmap
 from pathlib import Path
 
+CHUNK_SIZE = 1 << 24
+
 
 def string_data_length(text: str) -> int:
     count = 0
@@ -45,16 +48,87 @@ def total_difference_encoded_code(text: str) -> int:
     return total
 
 
+def _escapes(data: bytes) -> tuple[int, int, int]:
+    """
+    Escaped backslashes, hex escapes and escaped quotes in data that starts
+    outside an escape. Dropping escaped backslashes pairs up every run of
+    them as reading would, so each backslash left starts a quote, hex or
+    other escape.
+    """
+    unpaired = data.replace(b"\\\\", b"")
+    pairs = (len(data) - len(unpaired)) // 2
+    return pairs, unpaired.count(b"\\x"), unpaired.count(b'\\"')
+
+
+def _starts_escape(data: bytes, end: int) -> bool:
+    """
+    Whether the backslash just before end starts an escape, which is when
+    it ends an odd run of backslashes
+    """
+    head = data[:end]
+    return (len(head) - len(head.rstrip(b"\\"))) % 2 == 1
+
+
+def stream_differences(path: Path, chunk_size: int = CHUNK_SIZE) -> tuple[int, int]:
+    """
+    total_difference_code_data and total_difference_encoded_code of
+    a file in one pass over a memory map. Quotes, backslashes and escapes
+    are counted per chunk. Only an escape cut by the end of a chunk is
+    carried over: a pending backslash, or the hex digits left of a \\x.
+    """
+    if not path.stat().st_size:
+        return 0, 0
+    quotes = backslashes = pairs = hexes = escaped_quotes = 0
+    pending = False
+    hex_left = 0
+    with path.open("rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_size):
+                chunk = mapped[start : start + chunk_size]
+                quotes += chunk.count(b'"')
+                backslashes += chunk.count(b"\\")
+                position = 0
+                if pending:
+                    pending = False
+                    position = 1
+                    if chunk[:1] == b"\\":
+                        pairs += 1
+                    elif chunk[:1] == b'"':
+                        escaped_quotes += 1
+                    elif chunk[:1] == b"x":
+                        hexes += 1
+                        hex_left = 2
+                skipped = min(hex_left, len(chunk) - position)
+                hex_left -= skipped
+                body = chunk[position + skipped :]
+                end = len(body)
+                if _starts_escape(body, end):
+                    pending = True
+                    end -= 1
+                elif body.endswith(b"x") and _starts_escape(body, end - 1):
+                    hexes += 1
+                    hex_left = 2
+                    end -= 2
+                elif body[-2:-1] == b"x" and _starts_escape(body, end - 2):
+                    hexes += 1
+                    hex_left = 1
+                    end -= 3
+                counts = _escapes(body[:end])
+                pairs += counts[0]
+                hexes += counts[1]
+                escaped_quotes += counts[2]
+    saved = pairs + (backslashes - 2 * pairs) + 2 * hexes
+    strings = (quotes - escaped_quotes) // 2
+    return 2 * strings + saved, 2 * strings + quotes + backslashes
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
     args = parser.parse_args()
 
-    text = args.filename.read_text()
-    total_difference = total_difference_code_data(text)
+    total_difference, total_difference_encoded = stream_differences(args.filename)
     print(total_difference)
-
-    total_difference_encoded = total_difference_encoded_code(text)
     print(total_difference_encoded)
 
 
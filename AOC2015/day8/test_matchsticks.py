@@ -1,4 +1,5 @@
 from matchsticks import (
+    stream_differences,
     string_data_length,
     total_difference_code_data,
     total_difference_encoded_code,
@@ -26,3 +27,26 @@ def test_total_difference_encoded_code():
     "aaa\\"aaa"
     "\\x27"'''
     assert total_difference_encoded_code(text) == 19
+
+
+def test_stream_differences(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text('""\n"abc"\n"aaa\\"aaa"\n"\\x27"\n')
+    assert stream_differences(path) == (12, 19)
+
+
+def test_stream_differences_across_chunks(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_text('"\\\\\\x27"\n"a\\"\\\\"')
+    for chunk_size in (1, 2, 3, 5, 100):
+        assert stream_differences(path, chunk_size) == (10, 15)
+
+
+def test_stream_differences_long_line(tmp_path):
+    path = tmp_path / "input.txt"
+    line = '"' + 'ab\\\\\\"\\x4ax' * 40 + '"'
+    text = f'{line}\n""\n{line}'
+    path.write_text(text)
+    expected = (total_difference_code_data(text), total_difference_encoded_code(text))
+    for chunk_size in range(1, 14):
+        assert stream_differences(path, chunk_size) == expected
@@ -24,63 +24,81 @@ class Route:
         return Route(first, second, distance)
 
 
+def held_karp(
+    weights: list[list[int | None]], cyclic: bool = False
+) -> tuple[int, int] | None:
+    """
+    Minimum and maximum total weight of a path visiting every node once,
+    or of a closed tour when cyclic, found together by Held-Karp DP.
+    None weights are missing edges. Returns None if no such path exists.
+    """
+    if not cyclic:
+        # An open path is a tour through an extra node joined to everything
+        weights = [[0] * (len(weights) + 1)] + [[0] + row for row in weights]
+    n = len(weights) - 1
+    if n == 0:
+        return 0, 0
+    full = (1 << n) - 1
+    # lows[mask][j]: best tour from node 0 through mask, ending at node j + 1
+    lows: list[list[int | None] | None] = [None] * (full + 1)
+    highs: list[list[int | None] | None] = [None] * (full + 1)
+    for j in range(n):
+        first = weights[0][j + 1]
+        if first is not None:
+            lows[1 << j] = [first if k == j else None for k in range(n)]
+            highs[1 << j] = [first if k == j else None for k in range(n)]
+    for mask in range(1, full + 1):
+        low, high = lows[mask], highs[mask]
+        if low is None or high is None:
+            continue
+        for j in range(n):
+            if low[j] is None:
+                continue
+            row = weights[j + 1]
+            for k in range(n):
+                bit = 1 << k
+                if mask & bit or row[k + 1] is None:
+                    continue
+                after = mask | bit
+                if lows[after] is None:
+                    lows[after] = [None] * n
+                    highs[after] = [None] * n
+                next_low, next_high = lows[after], highs[after]
+                w = row[k + 1]
+                if next_low[k] is None or low[j] + w < next_low[k]:
+                    next_low[k] = low[j] + w
+                if next_high[k] is None or high[j] + w > next_high[k]:
+                    next_high[k] = high[j] + w
+    low, high = lows[full], highs[full]
+    if low is None or high is None:
+        return None
+    closing = [weights[j + 1][0] for j in range(n)]
+    lows_closed = [
+        low[j] + closing[j]
+        for j in range(n)
+        if low[j] is not None and closing[j] is not None
+    ]
+    highs_closed = [
+        high[j] + closing[j]
+        for j in range(n)
+        if high[j] is not None and closing[j] is not None
+    ]
+    if not lows_closed:
+        return None
+    return min(lows_closed), max(highs_closed)
+
+
 def find_extreme_routes(routes: list[Route]) -> tuple[int, int]:
-    routes_by_destination: dict[str, list[Route]] = {}
+    places = sorted({p for route in routes for p in (route.first, route.second)})
+    index = {place: i for i, place in enumerate(places)}
+    distances: list[list[int | None]] = [[None] * len(places) for _ in places]
     for route in routes:
-        if route.first not in routes_by_destination:
-            routes_by_destination[route.first] = []
-        if route.second not in routes_by_destination:
-            routes_by_destination[route.second] = []
-        routes_by_destination[route.first].append(route)
-        routes_by_destination[route.second].append(route)
-
-    mini: list[int | None] = [None]
-    maxi: list[int | None] = [None]
-    for start in routes_by_destination:
-        _find_extremum(start, routes_by_destination, {start}, 0, mini)
-        _find_extremum(start, routes_by_destination, {start}, 0, maxi, False)
-    if not mini[0] or not maxi[0]:
+        i, j = index[route.first], index[route.second]
+        distances[i][j] = distances[j][i] = route.distance
+    extremes = held_karp(distances)
+    if extremes is None:
         raise ValueError
-    return mini[0], maxi[0]
-
-
-def _find_extremum(
-    start: str,
-    routes_by_destination: dict[str, list[Route]],
-    path: set[str],
-    distance: int,
-    extremum: list[int | None],
-    find_minimum: bool = True,
-):
-    if extremum[0]:
-        if find_minimum and distance > extremum[0]:
-            return
-    if len(path) == len(routes_by_destination):
-        if not extremum[0]:
-            extremum[0] = distance
-        elif find_minimum:
-            extremum[0] = min(extremum[0], distance)
-        else:
-            extremum[0] = max(extremum[0], distance)
-        return
-    for route in routes_by_destination[start]:
-        if route.first in path and route.second in path:
-            continue
-        if route.first == start:
-            next_stop = route.second
-        else:
-            next_stop = route.first
-        next_distance = distance + route.distance
-        path.add(next_stop)
-        _find_extremum(
-            next_stop,
-            routes_by_destination,
-            path,
-            next_distance,
-            extremum,
-            find_minimum,
-        )
-        path.remove(next_stop)
+    return extremes
 
 
 def main():
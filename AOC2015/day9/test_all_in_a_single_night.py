@@ -1,4 +1,4 @@
-from all_in_a_single_night import Route, find_extreme_routes
+from all_in_a_single_night import Route, find_extreme_routes, held_karp
 
 
 def test_parse_route():
@@ -12,3 +12,10 @@ def test_find_extreme_routes():
     Dublin to Belfast = 141"""
     routes = [Route.parse(route) for route in text.splitlines()]
     assert find_extreme_routes(routes) == (605, 982)
+
+
+def test_held_karp():
+    distances = [[None, 1, 5, 2], [1, None, 1, 9], [5, 1, None, 1], [2, 9, 1, None]]
+    assert held_karp(distances) == (3, 16)
+    assert held_karp(distances, cyclic=True) == (5, 17)
+    assert held_karp([[None, None], [None, None]]) is None
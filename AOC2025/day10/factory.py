@@ -1,6 +1,18 @@
 import argparse
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from fractions import Fraction
+from functools import partial
+from itertools import product
+from math import lcm
+from operator import methodcaller
 from pathlib import Path
+from time import perf_counter
+from typing import TypeVar
+
+T = TypeVar("T")
 
 
 @dataclass(frozen=True)
@@ -76,7 +88,6 @@ class ManualLine:
                     if new_state == self.joltage_requirements:
                         return turns
                     if new_state in seen:
-                        print("seen")
                         continue
                     if any(
                         new_state[i] > self.joltage_requirements[i]
@@ -87,20 +98,184 @@ class ManualLine:
                     queue.append(new_state)
         return None
 
+    def minimum_to_configure_linear(self) -> int | None:
+        """
+        Solve buttons * x = target over GF(2), each row a bitmask over the buttons,
+        then try every combination of the null space for the fewest presses
+        """
+        lights = max(self.target.bit_length(), 1)
+        for button in self.buttons:
+            lights = max(lights, button.bit_pattern.bit_length())
+        rows = []
+        for light in range(lights):
+            mask = 0
+            for b, button in enumerate(self.buttons):
+                if button.bit_pattern >> light & 1:
+                    mask |= 1 << b
+            rows.append((mask, self.target >> light & 1))
+
+        pivots: list[tuple[int, int, int]] = []
+        for mask, rhs in rows:
+            for column, pivot_mask, pivot_rhs in pivots:
+                if mask >> column & 1:
+                    mask ^= pivot_mask
+                    rhs ^= pivot_rhs
+            if not mask:
+                if rhs:
+                    return None
+                continue
+            column = mask.bit_length() - 1
+            pivots = [
+                (c, m ^ mask, r ^ rhs) if m >> column & 1 else (c, m, r)
+                for c, m, r in pivots
+            ]
+            pivots.append((column, mask, rhs))
+
+        pivot_columns = {c for c, _, _ in pivots}
+        free = [b for b in range(len(self.buttons)) if b not in pivot_columns]
+        best = None
+        for choice in product((0, 1), repeat=len(free)):
+            presses = 0
+            for b, pressed in zip(free, choice):
+                presses |= pressed << b
+            for column, mask, rhs in pivots:
+                if rhs ^ ((mask & presses).bit_count() & 1):
+                    presses |= 1 << column
+            if best is None or presses.bit_count() < best:
+                best = presses.bit_count()
+        return best
+
+    def minimum_to_get_joltage_linear(self) -> int | None:
+        """
+        Gaussian elimination over the rationals, then enumerate the free
+        buttons up to the smallest requirement they contribute to
+        """
+        counters = len(self.joltage_requirements)
+        width = len(self.buttons)
+        matrix = [
+            [Fraction(int(i in button.positions)) for button in self.buttons]
+            + [Fraction(requirement)]
+            for i, requirement in enumerate(self.joltage_requirements)
+        ]
+        pivot_columns = []
+        row = 0
+        for column in range(width):
+            pivot = next((r for r in range(row, counters) if matrix[r][column]), None)
+            if pivot is None:
+                continue
+            matrix[row], matrix[pivot] = matrix[pivot], matrix[row]
+            scale = matrix[row][column]
+            matrix[row] = [x / scale for x in matrix[row]]
+            for r in range(counters):
+                if r != row and matrix[r][column]:
+                    factor = matrix[r][column]
+                    matrix[r] = [x - factor * y for x, y in zip(matrix[r], matrix[row])]
+            pivot_columns.append(column)
+            row += 1
+        if any(matrix[r][width] for r in range(row, counters)):
+            return None
+
+        bounds = [
+            min((self.joltage_requirements[i] for i in button.positions), default=0)
+            for button in self.buttons
+        ]
+        free = [c for c in range(width) if c not in pivot_columns]
+        # Scale each pivot row to integers: d * x_pivot = rhs - sum(c_f * x_f)
+        equations = []
+        for r, column in enumerate(pivot_columns):
+            d = lcm(*(x.denominator for x in matrix[r]))
+            equations.append(
+                (
+                    column,
+                    int(matrix[r][width] * d),
+                    [int(matrix[r][f] * d) for f in free],
+                    d,
+                )
+            )
+
+        best = None
+        for choice in product(*(range(bounds[f] + 1) for f in free)):
+            total = sum(choice)
+            if best is not None and total >= best:
+                continue
+            for column, rhs, coefficients, d in equations:
+                value = rhs - sum(c * x for c, x in zip(coefficients, choice))
+                if value < 0 or value % d:
+                    break
+                value //= d
+                if value > bounds[column]:
+                    break
+                total += value
+            else:
+                if best is None or total < best:
+                    best = total
+        return best
+
+
+def _timed(solve: Callable[[T], int], record: T) -> tuple[int, float]:
+    start = perf_counter()
+    result = solve(record)
+    return result, perf_counter() - start
+
+
+def run_batch(
+    solve: Callable[[T], int],
+    records: list[T],
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> tuple[int, list[float]]:
+    """
+    Solve independent records across a process pool,
+    returning the summed results and the time taken per record
+    """
+    if chunksize is None:
+        chunksize = max(1, len(records) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(partial(_timed, solve), records, chunksize=chunksize)
+        )
+    return sum(r for r, _ in results), [t for _, t in results]
+
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
+    parser.add_argument("--engine", choices=["bfs", "linear"], default="bfs")
+    parser.add_argument("--workers", type=int)
     args = parser.parse_args()
 
     text = args.filename.read_text()
     manual_lines = [ManualLine.parse(x) for x in text.splitlines()]
-    minimum_for_all = sum(ml.minimum_to_configure() for ml in manual_lines)
+    if args.workers:
+        suffix = "_linear" if args.engine == "linear" else ""
+        minimum_for_all, _ = run_batch(
+            methodcaller("minimum_to_configure" + suffix),
+            manual_lines,
+            args.workers,
+        )
+        print(minimum_for_all)
+        minimum_for_all_joltage, timings = run_batch(
+            methodcaller("minimum_to_get_joltage" + suffix),
+            manual_lines,
+            args.workers,
+        )
+        for i, t in enumerate(timings):
+            print(f"Done {i} in {t:.3f}s")
+        print(minimum_for_all_joltage)
+        return
+
+    if args.engine == "linear":
+        minimum_for_all = sum(ml.minimum_to_configure_linear() for ml in manual_lines)
+    else:
+        minimum_for_all = sum(ml.minimum_to_configure() for ml in manual_lines)
     print(minimum_for_all)
 
     minimum_for_all_joltage = 0
     for i, ml in enumerate(manual_lines):
-        minimum_for_all_joltage += ml.minimum_to_get_joltage()
+        if args.engine == "linear":
+            minimum_for_all_joltage += ml.minimum_to_get_joltage_linear()
+        else:
+            minimum_for_all_joltage += ml.minimum_to_get_joltage()
         print(f"Done {i}")
     print(minimum_for_all_joltage)
 
@@ -1,6 +1,8 @@
+from operator import methodcaller
+
 import pytest
 
-from factory import bit_pattern_from_indicator, Button, ManualLine
+from factory import bit_pattern_from_indicator, Button, ManualLine, run_batch
 
 
 @pytest.fixture()
@@ -56,3 +58,19 @@ def test_minimum_to_configure(manual_lines):
 
 def test_minimum_to_get_joltage(manual_lines):
     assert [ml.minimum_to_get_joltage() for ml in manual_lines] == [10, 12, 11]
+
+
+def test_minimum_to_configure_linear(manual_lines):
+    assert [ml.minimum_to_configure_linear() for ml in manual_lines] == [2, 3, 2]
+
+
+def test_minimum_to_get_joltage_linear(manual_lines):
+    assert [ml.minimum_to_get_joltage_linear() for ml in manual_lines] == [10, 12, 11]
+
+
+def test_run_batch(manual_lines):
+    total, timings = run_batch(
+        methodcaller("minimum_to_get_joltage_linear"), manual_lines, workers=2
+    )
+    assert total == 33
+    assert len(timings) == 3
@@ -1,4 +1,7 @@
 import argparse
+from collections import deque
+from collections.abc import Iterable
+from math import prod
 from pathlib import Path
 
 
@@ -50,17 +53,121 @@ def _count_paths(
     return cache[current]
 
 
+class CompiledGraph:
+    """
+    The connections with integer node ids in topological order,
+    answering path counts from cached per-source and per-target
+    count vectors
+    """
+
+    def __init__(self, connections: dict[str, list[str]]):
+        names = set(connections)
+        for outputs in connections.values():
+            names.update(outputs)
+        ids = {name: i for i, name in enumerate(sorted(names))}
+        self.names = sorted(names)
+        self.ids = ids
+        self.outputs = [[] for _ in self.names]
+        self.inputs = [[] for _ in self.names]
+        for source, outputs in connections.items():
+            for output in outputs:
+                self.outputs[ids[source]].append(ids[output])
+                self.inputs[ids[output]].append(ids[source])
+
+        in_degrees = [len(inputs) for inputs in self.inputs]
+        queue = deque(i for i, d in enumerate(in_degrees) if d == 0)
+        self.order: list[int] = []
+        while queue:
+            node = queue.popleft()
+            self.order.append(node)
+            for output in self.outputs[node]:
+                in_degrees[output] -= 1
+                if not in_degrees[output]:
+                    queue.append(output)
+        if len(self.order) != len(self.names):
+            raise ValueError("Connections contain a cycle")
+        self.position = [0] * len(self.names)
+        for position, node in enumerate(self.order):
+            self.position[node] = position
+
+        self._from: dict[tuple[int, frozenset[int]], list[int]] = {}
+        self._to: dict[tuple[int, frozenset[int]], list[int]] = {}
+
+    def _avoided(self, avoid: Iterable[str]) -> frozenset[int]:
+        return frozenset(self.ids[name] for name in avoid if name in self.ids)
+
+    def paths_from(self, source: str, avoid: Iterable[str] = ()) -> list[int]:
+        """
+        Number of paths from source to every node, indexed by node id
+        """
+        key = (self.ids[source], self._avoided(avoid))
+        if key not in self._from:
+            start, avoided = key
+            counts = [0] * len(self.names)
+            counts[start] = 1
+            for node in self.order[self.position[start] :]:
+                if not counts[node] or (node in avoided and node != start):
+                    continue
+                for output in self.outputs[node]:
+                    counts[output] += counts[node]
+            for node in avoided:
+                if node != start:
+                    counts[node] = 0
+            self._from[key] = counts
+        return self._from[key]
+
+    def paths_to(self, target: str, avoid: Iterable[str] = ()) -> list[int]:
+        """
+        Number of paths from every node to target, indexed by node id
+        """
+        key = (self.ids[target], self._avoided(avoid))
+        if key not in self._to:
+            end, avoided = key
+            counts = [0] * len(self.names)
+            counts[end] = 1
+            for node in reversed(self.order[: self.position[end] + 1]):
+                if not counts[node] or (node in avoided and node != end):
+                    continue
+                for source in self.inputs[node]:
+                    counts[source] += counts[node]
+            for node in avoided:
+                if node != end:
+                    counts[node] = 0
+            self._to[key] = counts
+        return self._to[key]
+
+    def count(self, start: str, target: str, avoid: Iterable[str] = ()) -> int:
+        if start not in self.ids or target not in self.ids:
+            return 0
+        avoid = tuple(avoid)
+        avoided = self._avoided(avoid)
+        if (self.ids[target], avoided) in self._to:
+            return self.paths_to(target, avoid)[self.ids[start]]
+        return self.paths_from(start, avoid)[self.ids[target]]
+
+    def count_via(
+        self,
+        start: str,
+        target: str,
+        waypoints: Iterable[str],
+        avoid: Iterable[str] = (),
+    ) -> int:
+        """
+        Paths from start to target through every waypoint in any order.
+        In a DAG they can only be visited in topological order,
+        so the count is the product over consecutive legs of that order.
+        """
+        waypoints = list(waypoints)
+        if any(w not in self.ids for w in waypoints):
+            return 0
+        stops = sorted(waypoints, key=lambda w: self.position[self.ids[w]])
+        avoid = tuple(avoid)
+        legs = zip([start] + stops, stops + [target])
+        return prod(self.count(a, b, avoid) for a, b in legs)
+
+
 def count_svr_dac_fft_out_paths(connections: dict[str, list[str]]) -> int:
-    svr_to_dac_paths = count_paths(connections, "svr", "dac", "fft")
-    svr_to_fft_paths = count_paths(connections, "svr", "fft", "dac")
-    dac_to_fft_paths = count_paths(connections, "dac", "fft")
-    fft_to_dac_paths = count_paths(connections, "fft", "dac")
-    dac_to_out_paths = count_paths(connections, "dac", "out", "fft")
-    fft_to_out_paths = count_paths(connections, "fft", "out", "dac")
-
-    count = svr_to_dac_paths * dac_to_fft_paths * fft_to_out_paths
-    count += svr_to_fft_paths * fft_to_dac_paths * dac_to_out_paths
-    return count
+    return CompiledGraph(connections).count_via("svr", "out", ["dac", "fft"])
 
 
 def main():
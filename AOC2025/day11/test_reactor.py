@@ -1,5 +1,5 @@
 import pytest
-from reactor import count_svr_dac_fft_out_paths, count_paths, parse
+from reactor import CompiledGraph, count_svr_dac_fft_out_paths, count_paths, parse
 
 
 @pytest.fixture
@@ -46,3 +46,25 @@ def test_count_paths(connections):
 
 def test_count_svr_dac_fft_out_paths(server_connections):
     assert count_svr_dac_fft_out_paths(server_connections) == 2
+
+
+def test_compiled_graph_count(connections):
+    graph = CompiledGraph(connections)
+    assert graph.count("you", "out") == 5
+    assert graph.count("you", "out", avoid=["ddd"]) == 3
+    assert graph.count("out", "you") == 0
+    assert graph.paths_to("out")[graph.ids["you"]] == 5
+    assert graph.count("aaa", "out") == 10
+
+
+def test_compiled_graph_count_via(server_connections):
+    graph = CompiledGraph(server_connections)
+    assert graph.count_via("svr", "out", ["fft", "dac"]) == 2
+    assert graph.count_via("svr", "out", ["dac"]) == 4
+    assert graph.count_via("svr", "out", ["dac"], avoid=["fft"]) == 2
+    assert graph.count_via("svr", "out", (w for w in ["fft", "dac"])) == 2
+
+
+def test_compiled_graph_cycle():
+    with pytest.raises(ValueError):
+        CompiledGraph({"a": ["b"], "b": ["a"]})
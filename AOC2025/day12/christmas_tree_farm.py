@@ -1,5 +1,14 @@
 import argparse
+import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import methodcaller
 from pathlib import Path
+from time import perf_counter
+from typing import TypeVar
+
+T = TypeVar("T")
 
 
 class Shape:
@@ -113,6 +122,91 @@ class Region:
                         self.unfill(row, column, variant)
         return False
 
+    def _placements(self) -> list[dict[int, list[int]]]:
+        """
+        The masks of every placement of every variant, grouped by
+        the lowest cell the placement covers and then by shape index
+        """
+        placements: list[dict[int, list[int]]] = [{} for _ in range(self.size())]
+        for shape in self.shapes:
+            for variant in shape.variants:
+                offsets = [
+                    r_idx * self.columns + c_idx
+                    for r_idx, shape_row in enumerate(variant)
+                    for c_idx, p in enumerate(shape_row)
+                    if p
+                ]
+                for row in range(self.rows - 2):
+                    for column in range(self.columns - 2):
+                        base = row * self.columns + column
+                        mask = 0
+                        for offset in offsets:
+                            mask |= 1 << (base + offset)
+                        lowest = base + offsets[0]
+                        placements[lowest].setdefault(shape.index, []).append(mask)
+        return placements
+
+    def can_fit_all_packed(self) -> bool:
+        """
+        Exact cover style search over a bitmask of the region.
+        The first empty cell is either covered by a placement starting there
+        or left empty, which is only allowed while the spare area lasts.
+        Every shape fits in a 3x3 box, so a piece covers at most one cell of
+        each (row % 3, column % 3) class; a state fails early when the free
+        cells of those classes cannot take the remaining area.
+        Wide regions are transposed so the scan runs along the short side.
+        Failed (occupancy, remaining) states are cached.
+        """
+        if self.size() < self.target_size():
+            return False
+        if (self.rows // 3) * (self.columns // 3) >= sum(self.target):
+            return True
+        if self.columns > self.rows:
+            return Region(
+                self.rows, self.columns, self.shapes, list(self.target)
+            ).can_fit_all_packed()
+
+        placements = self._placements()
+        classes = [0] * 9
+        for row in range(self.rows):
+            for column in range(self.columns):
+                classes[row % 3 * 3 + column % 3] |= 1 << (row * self.columns + column)
+        sizes = {shape.index: shape.size for shape in self.shapes}
+        area = self.size()
+        full = (1 << area) - 1
+        failed: set[tuple[int, tuple[int, ...]]] = set()
+
+        def search(occupied: int, remaining: tuple[int, ...], needed: int) -> bool:
+            while needed:
+                if area - occupied.bit_count() < needed or (
+                    (occupied, remaining) in failed
+                ):
+                    return False
+                free = ~occupied & full
+                pieces = sum(remaining)
+                if sum(min(pieces, (free & m).bit_count()) for m in classes) < needed:
+                    failed.add((occupied, remaining))
+                    return False
+                cell = (free & -free).bit_length() - 1
+                for index, masks in placements[cell].items():
+                    if not remaining[index]:
+                        continue
+                    after = list(remaining)
+                    after[index] -= 1
+                    after_remaining = tuple(after)
+                    for mask in masks:
+                        if occupied & mask:
+                            continue
+                        if search(
+                            occupied | mask, after_remaining, needed - sizes[index]
+                        ):
+                            return True
+                failed.add((occupied, remaining))
+                occupied |= 1 << cell
+            return True
+
+        return search(0, tuple(self.target), self.target_size())
+
     def __str__(self):
         x = ""
         for row in range(self.rows):
@@ -138,16 +232,53 @@ def parse(text):
     return regions
 
 
+def _timed(solve: Callable[[T], int], record: T) -> tuple[int, float]:
+    start = perf_counter()
+    result = solve(record)
+    return result, perf_counter() - start
+
+
+def run_batch(
+    solve: Callable[[T], int],
+    records: list[T],
+    workers: int | None = None,
+    chunksize: int | None = None,
+) -> tuple[int, list[float]]:
+    """
+    Solve independent records across a process pool,
+    returning the summed results and the time taken per record
+    """
+    if chunksize is None:
+        chunksize = max(1, len(records) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(partial(_timed, solve), records, chunksize=chunksize)
+        )
+    return sum(r for r, _ in results), [t for _, t in results]
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument(
+        "--engine", choices=["backtrack", "packed"], default="backtrack"
+    )
     args = parser.parse_args()
 
     text = args.filename.read_text()
     regions = parse(text)
+    solve = "can_fit_all_packed" if args.engine == "packed" else "can_fit_all"
+    if args.workers:
+        count, timings = run_batch(methodcaller(solve), regions, args.workers)
+        for i, t in enumerate(timings):
+            print(f"Region {i} in {t:.3f}s")
+        print(count)
+        return
+
     count = 0
     for region in regions:
-        count += region.can_fit_all()
+        count += getattr(region, solve)()
     print(count)
 
 
@@ -1,7 +1,29 @@
-from christmas_tree_farm import Shape
+from operator import methodcaller
+from pathlib import Path
+
+from christmas_tree_farm import Region, Shape, parse, run_batch
 
 
 def test_variants():
     shape = [[True, True, True], [True, True, False], [True, True, False]]
     s = Shape(shape, 0)
     assert not len(s.variants)
+
+
+def test_run_batch():
+    regions = parse((Path(__file__).parent / "files" / "test_input.txt").read_text())
+    count, timings = run_batch(methodcaller("can_fit_all"), regions, workers=2)
+    assert count == sum(region.can_fit_all() for region in regions)
+    assert len(timings) == 3
+
+
+def test_can_fit_all_packed():
+    regions = parse((Path(__file__).parent / "files" / "test_input.txt").read_text())
+    assert [region.can_fit_all_packed() for region in regions] == [True, True, False]
+
+
+def test_can_fit_all_packed_interlocking():
+    shape = Shape([[True, True, True], [True, True, False], [True, True, False]], 0)
+    assert Region(5, 3, [shape], [2]).can_fit_all_packed()
+    c_shape = Shape([[True, True, True], [True, False, False], [True, True, True]], 0)
+    assert not Region(5, 3, [c_shape], [2]).can_fit_all_packed()
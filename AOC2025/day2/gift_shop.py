@@ -1,4 +1,6 @@
 import argparse
+from itertools import combinations
+from math import prod
 from pathlib import Path
 
 from dataclasses import dataclass
@@ -68,17 +70,80 @@ class Range:
         max_times = len(str(self.end))
         return {n for x in range(2, max_times + 1) for n in self.repeats(x)}
 
+    def _lengths(self) -> range:
+        return range(len(str(self.start)), len(str(self.end)) + 1)
+
+    def _block_count_sum(self, length: int, block: int) -> tuple[int, int]:
+        """
+        Count and sum of the numbers with the given number of digits
+        made of a block of digits repeated, without listing them
+        """
+        lo = max(self.start, 10 ** (length - 1))
+        hi = min(self.end, 10**length - 1)
+        multiplier = (10**length - 1) // (10**block - 1)
+        first = max(-(-lo // multiplier), 10 ** (block - 1))
+        last = min(hi // multiplier, 10**block - 1)
+        if first > last:
+            return 0, 0
+        count = last - first + 1
+        return count, multiplier * (first + last) * count // 2
+
+    def repeat_count_sum(self, repeat_times: int) -> tuple[int, int]:
+        """
+        Count and sum of repeats(repeat_times), in O(1) memory
+        """
+        count = total = 0
+        for length in self._lengths():
+            if length % repeat_times:
+                continue
+            c, s = self._block_count_sum(length, length // repeat_times)
+            count += c
+            total += s
+        return count, total
+
+    def all_repeats_count_sum(self) -> tuple[int, int]:
+        """
+        Count and sum of all_repeats(), in O(1) memory.
+        For each length, a number repeated with block d is also repeated
+        with any multiple of d, so the union over the maximal blocks
+        length // p for primes p is taken by inclusion-exclusion.
+        """
+        count = total = 0
+        for length in self._lengths():
+            primes = _prime_factors(length)
+            for size in range(1, len(primes) + 1):
+                sign = 1 if size % 2 else -1
+                for subset in combinations(primes, size):
+                    c, s = self._block_count_sum(length, length // prod(subset))
+                    count += sign * c
+                    total += sign * s
+        return count, total
+
+
+def _prime_factors(n: int) -> list[int]:
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
 
 def parse_ranges(input_text: str) -> list[Range]:
     return [Range.parse(x.strip()) for x in input_text.split(",")]
 
 
 def sum_doubles(ranges: list[Range]) -> int:
-    return sum(d for r in ranges for d in r.doubles())
+    return sum(r.repeat_count_sum(2)[1] for r in ranges)
 
 
 def sum_repeats(ranges: list[Range]) -> int:
-    return sum(d for r in ranges for d in r.all_repeats())
+    return sum(r.all_repeats_count_sum()[1] for r in ranges)
 
 
 def main():
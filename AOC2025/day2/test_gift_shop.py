@@ -50,3 +50,19 @@ def test_fivepeats():
     r = Range(6868676926, 6868700146)
     fivepeats = r.repeats(5)
     assert fivepeats == [6868686868]
+
+
+@pytest.mark.parametrize("input_range,expected", input_ranges_to_doubles)
+def test_repeat_count_sum(input_range, expected):
+    assert input_range.repeat_count_sum(2) == (len(expected), sum(expected))
+
+
+def test_all_repeats_count_sum():
+    for r in [Range(1, 100000), Range(998, 1012), Range(222220, 222224)]:
+        repeats = r.all_repeats()
+        assert r.all_repeats_count_sum() == (len(repeats), sum(repeats))
+
+
+def test_all_repeats_count_sum_large():
+    count, _ = Range(1, 10**18 - 1).all_repeats_count_sum()
+    assert count > 10**9
@@ -69,13 +69,164 @@ class Grid:
                 self.set(row, column, Location.FREE)
         return count
 
+    def count_all_accessible_rolls_incremental(self) -> int:
+        """
+        Peel rolls in rounds, keeping a neighbour count per cell.
+        After each round only the neighbours of the removed rolls
+        can have become accessible, so only those are re-queued.
+        """
+        counts = [
+            [self.count_roll_neighbours(r_idx, c_idx) for c_idx in range(len(r))]
+            for r_idx, r in enumerate(self.grid)
+        ]
+        count = 0
+        accessible = self.get_accessible_rolls()
+        while accessible:
+            count += len(accessible)
+            for row, column in accessible:
+                self.set(row, column, Location.FREE)
+            queued = []
+            for row, column in accessible:
+                for dr, dc in DIRECTIONS:
+                    r, c = row + dr, column + dc
+                    if self.get(r, c) is not Location.ROLL:
+                        continue
+                    counts[r][c] -= 1
+                    if counts[r][c] == 3:
+                        queued.append((r, c))
+            accessible = queued
+        return count
+
+
+class BitGrid:
+    """
+    The roll map packed into a single integer, one bit per cell.
+    Each row is followed by an empty guard bit so that shifting
+    by one column never wraps onto the neighbouring row.
+    """
+
+    def __init__(self, rolls: int, height: int, width: int):
+        self.height = height
+        self.width = width
+        self.stride = width + 1
+        row_mask = (1 << width) - 1
+        self.mask = sum(row_mask << (r * self.stride) for r in range(height))
+        self.rolls = rolls & self.mask
+        self.offsets = [dr * self.stride + dc for dr, dc in DIRECTIONS]
+
+    @staticmethod
+    def parse(text: str) -> "BitGrid":
+        return BitGrid.from_grid(Grid.parse(text))
+
+    @staticmethod
+    def from_grid(grid: Grid) -> "BitGrid":
+        height = len(grid.grid)
+        width = max((len(r) for r in grid.grid), default=0)
+        stride = width + 1
+        rolls = 0
+        for r_idx, r in enumerate(grid.grid):
+            for c_idx, c in enumerate(r):
+                if c is Location.ROLL:
+                    rolls |= 1 << (r_idx * stride + c_idx)
+        return BitGrid(rolls, height, width)
+
+    @property
+    def grid(self) -> list[list[Location]]:
+        return [
+            [self.get(r, c) for c in range(self.width)] for r in range(self.height)
+        ]
+
+    def _bit(self, row: int, column: int) -> int:
+        return 1 << (row * self.stride + column)
+
+    def get(self, row: int, column: int) -> Location | None:
+        if row < 0 or row >= self.height or column < 0 or column >= self.width:
+            return None
+        return Location.ROLL if self.rolls & self._bit(row, column) else Location.FREE
+
+    def set(self, row: int, column: int, location: Location):
+        if location is Location.ROLL:
+            self.rolls |= self._bit(row, column)
+        else:
+            self.rolls &= ~self._bit(row, column)
+
+    def _shift(self, board: int, offset: int) -> int:
+        """
+        Move the bit of the neighbour at offset onto each cell
+        """
+        if offset > 0:
+            return (board >> offset) & self.mask
+        return (board << -offset) & self.mask
+
+    def _crowded(self) -> int:
+        """
+        Cells with at least four rolls around them.
+        The eight shifted boards are summed with a bit-sliced
+        ripple-carry adder into four bit planes of the count.
+        """
+        planes = [0, 0, 0, 0]
+        for offset in self.offsets:
+            carry = self._shift(self.rolls, offset)
+            for i, plane in enumerate(planes):
+                if not carry:
+                    break
+                planes[i] = plane ^ carry
+                carry &= plane
+        return planes[2] | planes[3]
+
+    def _dilate(self, board: int) -> int:
+        result = 0
+        for offset in self.offsets:
+            result |= self._shift(board, offset)
+        return result
+
+    def count_roll_neighbours(self, row: int, column: int) -> int:
+        return sum(
+            self.get(row + d[0], column + d[1]) is Location.ROLL for d in DIRECTIONS
+        )
+
+    def is_accessible(self, row: int, column: int) -> bool:
+        return self.count_roll_neighbours(row, column) < 4
+
+    def _accessible(self) -> int:
+        return self.rolls & ~self._crowded()
+
+    def count_accessible_rolls(self) -> int:
+        return self._accessible().bit_count()
+
+    def get_accessible_rolls(self) -> list[tuple[int, int]]:
+        accessible = []
+        board = self._accessible()
+        while board:
+            low = board & -board
+            idx = low.bit_length() - 1
+            accessible.append(divmod(idx, self.stride))
+            board ^= low
+        return accessible
+
+    def count_all_accessible_rolls(self) -> int:
+        """
+        After the first round only rolls next to a removed roll
+        can become accessible, so each later round keeps just those.
+        The neighbour counts are still taken over the whole board.
+        """
+        count = 0
+        accessible = self._accessible()
+        while accessible:
+            count += accessible.bit_count()
+            self.rolls &= ~accessible
+            accessible = self.rolls & self._dilate(accessible) & ~self._crowded()
+        return count
+
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
+    parser.add_argument("--backend", choices=["list", "bits"], default="list")
     args = parser.parse_args()
 
-    grid = Grid.parse(args.filename.read_text())
+    text = args.filename.read_text()
+    grid = BitGrid.parse(text) if args.backend == "bits" else Grid.parse(text)
     print(grid.count_accessible_rolls())
     print(grid.count_all_accessible_rolls())
 
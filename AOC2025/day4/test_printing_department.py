@@ -1,6 +1,6 @@
 import pytest
 
-from printing_department import Grid, Location
+from printing_department import BitGrid, Grid, Location
 
 
 @pytest.fixture
@@ -43,3 +43,17 @@ def test_accessible_count(grid: Grid):
 
 def test_all_accessible_count(grid: Grid):
     assert grid.count_all_accessible_rolls() == 43
+
+
+def test_all_accessible_count_incremental(grid: Grid):
+    assert grid.count_all_accessible_rolls_incremental() == 43
+
+
+def test_bit_grid_matches_grid(grid: Grid):
+    bit_grid = BitGrid.from_grid(grid)
+    assert bit_grid.grid == grid.grid
+    assert bit_grid.count_roll_neighbours(1, 1) == 6
+    assert bit_grid.get(0, 10) is None
+    assert bit_grid.count_accessible_rolls() == 13
+    assert bit_grid.get_accessible_rolls() == grid.get_accessible_rolls()
+    assert bit_grid.count_all_accessible_rolls() == 43
@@ -1,7 +1,8 @@
 import argparse
+from bisect import bisect_right
 from dataclasses import dataclass
-from itertools import combinations
 from pathlib import Path
+from typing import Iterable
 
 
 @dataclass(frozen=True)
@@ -44,34 +45,61 @@ def parse_input(text: str) -> tuple[list[Range], list[int]]:
     return ranges, ingredients
 
 
-def get_fresh_ingredients(ranges: list[Range], ingredients: list[int]) -> list[int]:
-    fresh = []
-    for ingredient in ingredients:
-        for r in ranges:
-            if ingredient in r:
-                fresh.append(ingredient)
+def merge_ranges(ranges: list[Range]) -> list[Range]:
+    """
+    Sort by start and sweep, extending the current range
+    while the next one overlaps it
+    """
+    result: list[Range] = []
+    for r in sorted(ranges, key=lambda r: r.start):
+        if result and r.start <= result[-1].end:
+            if r.end > result[-1].end:
+                result[-1] = Range(result[-1].start, r.end)
+        else:
+            result.append(r)
+    return result
+
+
+class RangeSet:
+    """
+    Disjoint, sorted ranges with O(log n) membership by bisecting the starts
+    """
+
+    def __init__(self, ranges: list[Range]):
+        merged = merge_ranges(ranges)
+        self.starts = [r.start for r in merged]
+        self.ends = [r.end for r in merged]
+
+    def __contains__(self, ingredient: int) -> bool:
+        idx = bisect_right(self.starts, ingredient) - 1
+        return idx >= 0 and ingredient <= self.ends[idx]
+
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+    def ranges(self) -> list[Range]:
+        return [Range(start, end) for start, end in zip(self.starts, self.ends)]
+
+    def filter_sorted(self, ingredients: Iterable[int]) -> list[int]:
+        """
+        Walk sorted ingredients and ranges together in a single pass
+        """
+        fresh = []
+        idx = 0
+        n = len(self.starts)
+        for ingredient in ingredients:
+            while idx < n and self.ends[idx] < ingredient:
+                idx += 1
+            if idx == n:
                 break
-    return fresh
+            if self.starts[idx] <= ingredient:
+                fresh.append(ingredient)
+        return fresh
 
 
-def merge_ranges(ranges: list[Range]) -> list[Range]:
-    any_merges = True
-    result = ranges
-    while any_merges:
-        any_merges = False
-        n = []
-        merged = set()
-        for r1, r2 in combinations(result, 2):
-            if not r1.can_merge(r2):
-                continue
-            any_merges = True
-            merged.add(r1)
-            merged.add(r2)
-            n.append(r1.merge(r2))
-            break
-        n.extend(r for r in result if r not in merged)
-        result = n
-    return result
+def get_fresh_ingredients(ranges: list[Range], ingredients: list[int]) -> list[int]:
+    range_set = RangeSet(ranges)
+    return [ingredient for ingredient in ingredients if ingredient in range_set]
 
 
 def main():
@@ -80,10 +108,10 @@ def main():
     args = parser.parse_args()
 
     ranges, ingredients = parse_input(args.filename.read_text())
-    merged_ranges = merge_ranges(ranges)
-    fresh_ingredients = get_fresh_ingredients(merged_ranges, ingredients)
+    range_set = RangeSet(ranges)
+    fresh_ingredients = range_set.filter_sorted(sorted(ingredients))
     print(len(fresh_ingredients))
-    print(sum(len(r) for r in merged_ranges))
+    print(len(range_set))
 
 
 if __name__ == "__main__":
@@ -1,4 +1,10 @@
-from cafeteria import Range, parse_input, get_fresh_ingredients, merge_ranges
+from cafeteria import (
+    Range,
+    RangeSet,
+    parse_input,
+    get_fresh_ingredients,
+    merge_ranges,
+)
 
 
 def test_contained_id():
@@ -57,3 +63,24 @@ def test_merge_ranges():
     assert len(merged_ranges) == 2
     assert Range(3, 5) in merged_ranges
     assert Range(10, 20) in merged_ranges
+
+
+def test_merge_ranges_contained():
+    ranges = [Range(1, 10), Range(5, 6), Range(12, 14), Range(10, 11)]
+    assert merge_ranges(ranges) == [Range(1, 11), Range(12, 14)]
+
+
+def test_range_set():
+    range_set = RangeSet([Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)])
+    assert range_set.ranges() == [Range(3, 5), Range(10, 20)]
+    assert len(range_set) == 14
+    assert 3 in range_set
+    assert 20 in range_set
+    assert 2 not in range_set
+    assert 8 not in range_set
+    assert 21 not in range_set
+
+
+def test_range_set_filter_sorted():
+    range_set = RangeSet([Range(3, 5), Range(10, 14), Range(16, 20), Range(12, 18)])
+    assert range_set.filter_sorted([1, 5, 8, 11, 17, 32]) == [5, 11, 17]
@@ -1,9 +1,11 @@
 import argparse
+from array import array
+from collections import defaultdict
 from dataclasses import dataclass
-from heapq import heapify, heappop
+from heapq import heapify, heappop, nlargest
 from itertools import combinations
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Hashable, Iterable
 
 
 @dataclass(frozen=True)
@@ -39,20 +41,118 @@ def closest_pairs(boxes: list[JunctionBox]) -> Generator[JunctionBoxPair, None,
         yield heappop(pairs)
 
 
-class UnionFind:
+class JunctionBoxArray:
+    """
+    Junction box coordinates stored column-wise in int64 arrays
+    and referred to by index
+    """
+
     def __init__(self, boxes: list[JunctionBox]):
+        self.xs = array("q", (b.x for b in boxes))
+        self.ys = array("q", (b.y for b in boxes))
+        self.zs = array("q", (b.z for b in boxes))
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    @staticmethod
+    def parse(text: str) -> "JunctionBoxArray":
+        return JunctionBoxArray([JunctionBox.parse(line) for line in text.split()])
+
+    def box(self, i: int) -> JunctionBox:
+        return JunctionBox(self.xs[i], self.ys[i], self.zs[i])
+
+    def distance_squared(self, i: int, j: int) -> int:
+        return (
+            (self.xs[i] - self.xs[j]) ** 2
+            + (self.ys[i] - self.ys[j]) ** 2
+            + (self.zs[i] - self.zs[j]) ** 2
+        )
+
+
+# Half of the 3x3x3 neighbourhood, so each pair of cells is visited once
+FORWARD_CELLS = [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+]
+
+
+def _pairs_within(
+    boxes: JunctionBoxArray, low: int, high: int
+) -> list[tuple[int, int, int]]:
+    """
+    All (distance squared, i, j) with low <= distance < high.
+    With cells of side high, any such pair lies in the same or adjacent cells.
+    """
+    xs, ys, zs = boxes.xs, boxes.ys, boxes.zs
+    cells: defaultdict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for i in range(len(boxes)):
+        cells[(xs[i] // high, ys[i] // high, zs[i] // high)].append(i)
+
+    low_squared = low * low
+    high_squared = high * high
+    pairs = []
+
+    def add_pair(i: int, j: int):
+        d = (xs[i] - xs[j]) ** 2 + (ys[i] - ys[j]) ** 2 + (zs[i] - zs[j]) ** 2
+        if low_squared <= d < high_squared:
+            pairs.append((d, i, j) if i < j else (d, j, i))
+
+    for (cx, cy, cz), members in cells.items():
+        for a, i in enumerate(members):
+            for j in members[a + 1 :]:
+                add_pair(i, j)
+        for dx, dy, dz in FORWARD_CELLS:
+            for j in cells.get((cx + dx, cy + dy, cz + dz), ()):
+                for i in members:
+                    add_pair(i, j)
+    return pairs
+
+
+def candidate_pairs(
+    boxes: JunctionBoxArray,
+) -> Generator[tuple[int, int, int], None, None]:
+    """
+    Stream (distance squared, i, j) in increasing distance.
+    Distances are processed in doubling shells [r, 2r), bucketing the
+    boxes into a uniform grid of side 2r for each shell, so only the
+    pairs of the current shell are ever held in memory.
+    """
+    n = len(boxes)
+    if n < 2:
+        return
+    spans = [max(c) - min(c) for c in (boxes.xs, boxes.ys, boxes.zs)]
+    max_distance_squared = sum(span * span for span in spans)
+    volume = max(1, spans[0]) * max(1, spans[1]) * max(1, spans[2])
+    low = 0
+    high = max(1, round((volume / n) ** (1 / 3)))
+    while low * low <= max_distance_squared:
+        pairs = _pairs_within(boxes, low, high)
+        pairs.sort()
+        yield from pairs
+        low, high = high, high * 2
+
+
+class UnionFind:
+    def __init__(self, boxes: list[Hashable]):
         self.count = len(boxes)
         self.sizes = {b: 1 for b in boxes}
         self.parents = {b: b for b in boxes}
 
-    def _find_parent(self, box: JunctionBox) -> JunctionBox:
+    def _find_parent(self, box: Hashable) -> Hashable:
         while box != self.parents[box]:
             box = self.parents[box]
         return box
 
     def union(self, pair: JunctionBoxPair):
-        p1 = self._find_parent(pair.j1)
-        p2 = self._find_parent(pair.j2)
+        self.join(pair.j1, pair.j2)
+
+    def join(self, b1: Hashable, b2: Hashable):
+        p1 = self._find_parent(b1)
+        p2 = self._find_parent(b2)
         if p1 == p2:
             return
         if self.sizes[p1] < self.sizes[p2]:
@@ -65,8 +165,55 @@ class UnionFind:
 
     def get_three_largest_component_sizes(self) -> tuple[int, int, int]:
         roots = [p for p in self.parents if self.parents[p] == p]
-        sizes = sorted([self.sizes[p] for p in roots])
-        a, b, c = sizes[-3:]
+        c, b, a = nlargest(3, (self.sizes[p] for p in roots))
+        return a, b, c
+
+
+class IndexUnionFind:
+    """
+    Union find over the indices 0..n-1 with flat arrays
+    and path halving
+    """
+
+    def __init__(self, n: int):
+        self.count = n
+        self.sizes = array("i", [1]) * n
+        self.parents = array("i", range(n))
+
+    def _find_parent(self, i: int) -> int:
+        parents = self.parents
+        while i != parents[i]:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        p1 = self._find_parent(i)
+        p2 = self._find_parent(j)
+        if p1 == p2:
+            return False
+        if self.sizes[p1] < self.sizes[p2]:
+            p1, p2 = p2, p1
+        self.parents[p2] = p1
+        self.sizes[p1] += self.sizes[p2]
+        self.count -= 1
+        return True
+
+    def union_many(self, first: Iterable[int], second: Iterable[int]) -> int:
+        """
+        Union first[k] with second[k] for every k, returning the number of merges
+        """
+        merges = 0
+        for i, j in zip(first, second):
+            if self.union(i, j):
+                merges += 1
+        return merges
+
+    def get_three_largest_component_sizes(self) -> tuple[int, int, int]:
+        parents = self.parents
+        c, b, a = nlargest(
+            3, (size for i, size in enumerate(self.sizes) if parents[i] == i)
+        )
         return a, b, c
 
 
@@ -80,6 +227,21 @@ def connect_until_single_circuit(boxes: list[JunctionBox]) -> JunctionBoxPair:
             return pair
 
 
+def connect_until_single_circuit_kruskal(
+    boxes: JunctionBoxArray,
+) -> tuple[int, int]:
+    """
+    Kruskal over the streamed candidate pairs, stopping
+    as soon as a single component remains
+    """
+    uf = IndexUnionFind(len(boxes))
+    for _, i, j in candidate_pairs(boxes):
+        uf.union(i, j)
+        if uf.count == 1:
+            return i, j
+    raise ValueError("Need at least two junction boxes")
+
+
 def get_largest_circuits(boxes: list[JunctionBox], n: int) -> tuple[int, int, int]:
     pairs = closest_pairs(boxes)
     uf = UnionFind(boxes)
@@ -93,9 +255,28 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
     parser.add_argument("iterates", type=int)
+    parser.add_argument("--engine", choices=["heap", "grid"], default="heap")
     args = parser.parse_args()
 
-    boxes = [JunctionBox.parse(line) for line in args.filename.read_text().splitlines()]
+    text = args.filename.read_text()
+    if args.engine == "grid":
+        box_array = JunctionBoxArray.parse(text)
+        uf = IndexUnionFind(len(box_array))
+        pairs = candidate_pairs(box_array)
+        first, second = array("i"), array("i")
+        for _ in range(args.iterates):
+            _, i, j = next(pairs)
+            first.append(i)
+            second.append(j)
+        uf.union_many(first, second)
+        a, b, c = uf.get_three_largest_component_sizes()
+        print(a * b * c)
+
+        i, j = connect_until_single_circuit_kruskal(box_array)
+        print(box_array.xs[i] * box_array.xs[j])
+        return
+
+    boxes = [JunctionBox.parse(line) for line in text.splitlines()]
     a, b, c = get_largest_circuits(boxes, args.iterates)
     print(a * b * c)
 
@@ -1,10 +1,14 @@
 import pytest
 
 from playground import (
+    candidate_pairs,
     closest_pairs,
     connect_until_single_circuit,
+    connect_until_single_circuit_kruskal,
     get_largest_circuits,
+    IndexUnionFind,
     JunctionBox,
+    JunctionBoxArray,
 )
 
 
@@ -68,3 +72,32 @@ def test_connect_until_single_circuit(junction_boxes: list[JunctionBox]):
         JunctionBox(216, 146, 977),
         JunctionBox(117, 168, 530),
     }
+
+
+def test_candidate_pairs_match_closest_pairs(junction_boxes: list[JunctionBox]):
+    box_array = JunctionBoxArray(junction_boxes)
+    streamed = [d for d, _, _ in candidate_pairs(box_array)]
+    expected = [pair.distance_squared for pair in closest_pairs(junction_boxes)]
+    assert streamed == expected
+    _, i, j = next(candidate_pairs(box_array))
+    assert {box_array.box(i), box_array.box(j)} == {
+        JunctionBox(162, 817, 812),
+        JunctionBox(425, 690, 689),
+    }
+
+
+def test_connect_until_single_circuit_kruskal(junction_boxes: list[JunctionBox]):
+    box_array = JunctionBoxArray(junction_boxes)
+    i, j = connect_until_single_circuit_kruskal(box_array)
+    assert {box_array.box(i), box_array.box(j)} == {
+        JunctionBox(216, 146, 977),
+        JunctionBox(117, 168, 530),
+    }
+
+
+def test_index_union_find():
+    uf = IndexUnionFind(8)
+    assert uf.union_many([0, 1, 3, 4, 5, 0], [1, 2, 4, 5, 6, 2]) == 5
+    assert uf.count == 3
+    assert not uf.union(2, 0)
+    assert uf.get_three_largest_component_sizes() == (1, 3, 4)
@@ -1,6 +1,10 @@
 import argparse
+from array import array
+from bisect import insort
+from collections import defaultdict
 from dataclasses import dataclass
-from itertools import combinations, pairwise
+from itertools import accumulate, combinations, pairwise
+from operator import add
 from pathlib import Path
 
 
@@ -163,6 +167,116 @@ def get_maximum_interior_area(tiles: list[Tile]) -> int:
     return current_max
 
 
+class CompressedAxis:
+    """
+    One cell per distinct vertex coordinate, plus one cell for
+    each non-empty gap between consecutive coordinates
+    """
+
+    def __init__(self, values: set[int]):
+        self.index: dict[int, int] = {}
+        self.cells: list[tuple[int, bool]] = []
+        ordered = sorted(values)
+        for value, following in pairwise(ordered + [ordered[-1] + 1]):
+            self.index[value] = len(self.cells)
+            self.cells.append((value, True))
+            if following - value > 1:
+                self.cells.append((value + 1, False))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+
+class InteriorRaster:
+    """
+    The polygon interior rasterised on the compressed grid,
+    with a 2D prefix sum of exterior cells so that any
+    rectangle between two vertices is checked in O(1)
+    """
+
+    def __init__(self, tiles: list[Tile]):
+        self.columns = CompressedAxis({t.column for t in tiles})
+        self.rows = CompressedAxis({t.row for t in tiles})
+
+        horizontal: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        starting: defaultdict[int, list[int]] = defaultdict(list)
+        ending: defaultdict[int, list[int]] = defaultdict(list)
+        for edge in get_edges(tiles):
+            if edge.is_horizontal():
+                low, high = sorted((edge.start.column, edge.end.column))
+                horizontal[edge.start.row].append((low, high))
+            else:
+                low, high = sorted((edge.start.row, edge.end.row))
+                starting[low].append(edge.start.column)
+                ending[high].append(edge.start.column)
+
+        width = len(self.columns)
+        flip = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+        # One flat row-major array, each row of the prefix sum
+        # taking width + 1 slots starting at row * self.stride
+        self.stride = width + 1
+        self.prefix = array("q", [0]) * (self.stride * (len(self.rows) + 1))
+        previous = self.prefix[: self.stride]
+        # Columns of the vertical edges crossing just above the current row
+        active: list[int] = []
+        for index, (row, is_vertex) in enumerate(self.rows.cells, start=1):
+            interior = bytearray(width)
+            for a, b in zip(active[::2], active[1::2]):
+                start, end = self.columns.index[a], self.columns.index[b]
+                interior[start : end + 1] = b"\x01" * (end - start + 1)
+            if is_vertex:
+                for a, b in horizontal[row]:
+                    start, end = self.columns.index[a], self.columns.index[b]
+                    interior[start : end + 1] = b"\x01" * (end - start + 1)
+                for column in ending[row]:
+                    active.remove(column)
+                for column in starting[row]:
+                    insort(active, column)
+            exterior = interior.translate(flip)
+            row_sums = array("q", [0])
+            row_sums.extend(map(add, previous[1:], accumulate(exterior)))
+            self.prefix[index * self.stride : (index + 1) * self.stride] = row_sums
+            previous = row_sums
+
+    def is_interior_rectangle(self, t1: Tile, t2: Tile) -> bool:
+        r1, r2 = sorted((self.rows.index[t1.row], self.rows.index[t2.row]))
+        c1, c2 = sorted((self.columns.index[t1.column], self.columns.index[t2.column]))
+        p, top, bottom = self.prefix, r1 * self.stride, (r2 + 1) * self.stride
+        exterior = p[bottom + c2 + 1] - p[top + c2 + 1] - p[bottom + c1] + p[top + c1]
+        return exterior == 0
+
+
+def get_maximum_interior_area_compressed(tiles: list[Tile]) -> int:
+    """
+    Visit the tiles by the largest area they could possibly span,
+    and each tile's partners by descending area, stopping as soon
+    as nothing left can beat the current maximum
+    """
+    raster = InteriorRaster(tiles)
+    min_column = min(t.column for t in tiles)
+    max_column = max(t.column for t in tiles)
+    min_row = min(t.row for t in tiles)
+    max_row = max(t.row for t in tiles)
+
+    def bound(t: Tile) -> int:
+        width = max(t.column - min_column, max_column - t.column) + 1
+        height = max(t.row - min_row, max_row - t.row) + 1
+        return width * height
+
+    current_max = 0
+    for t1 in sorted(tiles, key=bound, reverse=True):
+        if bound(t1) <= current_max:
+            break
+        areas = sorted(((t1.area(t2), t2) for t2 in tiles), key=lambda a: -a[0])
+        for area, t2 in areas:
+            if area <= current_max:
+                break
+            if raster.is_interior_rectangle(t1, t2):
+                current_max = area
+                break
+    return current_max
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("filename", type=Path)
@@ -173,7 +287,7 @@ def main():
     max_area = get_maximum_area(tiles)
     print(max_area)
 
-    max_interior_area = get_maximum_interior_area(tiles)
+    max_interior_area = get_maximum_interior_area_compressed(tiles)
     print(max_interior_area)
 
 
@@ -1,9 +1,11 @@
 import pytest
 from movie_theater import (
     Edge,
+    InteriorRaster,
     Tile,
     get_maximum_area,
     get_maximum_interior_area,
+    get_maximum_interior_area_compressed,
     get_edges,
     is_interior_edge,
     is_interior_point,
@@ -38,6 +40,18 @@ def test_get_maximum_interior_area(tiles: list[Tile]):
     assert get_maximum_interior_area(tiles) == 24
 
 
+def test_get_maximum_interior_area_compressed(tiles: list[Tile]):
+    assert get_maximum_interior_area_compressed(tiles) == 24
+
+
+def test_raster_is_interior_rectangle(tiles: list[Tile]):
+    raster = InteriorRaster(tiles)
+    assert raster.is_interior_rectangle(Tile(row=3, column=2), Tile(row=5, column=9))
+    assert not raster.is_interior_rectangle(
+        Tile(column=11, row=7), Tile(column=2, row=3)
+    )
+
+
 def test_is_interior_edge(tiles: list[Tile]):
     edges = get_edges(tiles)
     tstart = Tile(row=5, column=2)